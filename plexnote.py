@@ -8,35 +8,60 @@ Komplett neu, 06/2025, logisch gegliedert in Funktionsblöcke
 # 1. KONFIGURATION & GRUNDLAGEN
 # ─────────────────────────────────────────────────────────────
 
-import os, sys, re, time, json, html, argparse, urllib.parse, unicodedata, contextlib, threading
+import os, sys, re, time, json, html, argparse, urllib.parse, contextlib, threading, functools, sqlite3, atexit
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime
 from typing import Any, Dict, Optional, Tuple, List
 import requests
+try:
+    import orjson                            # optional, deutlich schneller (de)serialisieren
+except ImportError:
+    orjson = None
+from urllib3.util.retry import Retry
 
 # ---- Einstellungen ----
-class Config:	
-	WEBHOOK_URL      = os.getenv("DISCORD_WEBHOOK_URL", "https://discord.com/api/webhooks/123456789012345678/abcDEFghIJklMNopQRstUVwxYZ1234567890abcdEFGHijklmNOPQ")
-	TAUTULLI_URL     = os.getenv("TAUTULLI_URL",        "http://localhost:8181")
-	TAUTULLI_API_KEY = os.getenv("TAUTULLI_API_KEY",    "1234abcd5678efgh9012ijkl3456mnop")
-	TVDB_API_KEY     = os.getenv("TVDB_API_KEY",        "abcd1234-5678-90ef-gh12-ijklmnopqrst")
-	TMDB_API_KEY     = os.getenv("TMDB_API_KEY",        "abcd5678efgh9012ijkl3456mnop7890")
-	PLEX_BASE_URL    = os.getenv("PLEX_BASE_URL",       "https://app.plex.tv")
-	PLEX_SERVER_ID   = os.getenv("PLEX_SERVER_ID",      "1234567890abcdef1234567890abcdef12345678")
+class Config:
+    WEBHOOK_URL      = os.getenv("DISCORD_WEBHOOK_URL", "https://discord.com/api/webhooks/123456789012345678/abcDEFghIJklMNopQRstUVwxYZ1234567890abcdEFGHijklmNOPQ")
+    TAUTULLI_URL     = os.getenv("TAUTULLI_URL",        "http://localhost:8181")
+    TAUTULLI_API_KEY = os.getenv("TAUTULLI_API_KEY",    "1234abcd5678efgh9012ijkl3456mnop")
+    TVDB_API_KEY     = os.getenv("TVDB_API_KEY",        "abcd1234-5678-90ef-gh12-ijklmnopqrst")
+    TMDB_API_KEY     = os.getenv("TMDB_API_KEY",        "abcd5678efgh9012ijkl3456mnop7890")
+    PLEX_BASE_URL    = os.getenv("PLEX_BASE_URL",       "https://app.plex.tv")
+    PLEX_SERVER_ID   = os.getenv("PLEX_SERVER_ID",      "1234567890abcdef1234567890abcdef12345678")
 
-	PLACEHOLDER_IMG  = "https://cdn.discordapp.com/attachments/000000000000000000/000000000000000000/placeholder_image.webp"
+    PLACEHOLDER_IMG  = "https://cdn.discordapp.com/attachments/000000000000000000/000000000000000000/placeholder_image.webp"
 
-    POSTED_KEYS_FILE = "posted.json"
-    POSTED_KEYS_MAX  = 200
+    POSTED_KEYS_FILE   = "posted.jsonl"
+    POSTED_KEYS_LEGACY = "posted.json"     # altes Listen-Format, wird einmalig übernommen
+    POSTED_KEYS_MAX    = 200
 
     COLOR_MOVIE, COLOR_SEASON, COLOR_SHOW = 0x1abc9c, 0x3498db, 0xe67e22
     MAX_LINE_LEN, MAX_LINES, PLOT_LIMIT   = 45, 4, 150
     MAX_WORD_SPLIT_LEN, SINGLE_LINE_LIMIT = 60, 36
     HTTP_TIMEOUT, TMDB_TIMEOUT            = 20, 4
+    HTTP_POOL_HOSTS, HTTP_POOL_SIZE       = 4, 20
+    MAX_WORKERS                           = 8
+    # Wartezeit des Embeds auf seine parallelen Abrufe – begrenzt nicht die Prozesslaufzeit:
+    # bereits laufende Requests enden erst mit ihrem eigenen HTTP-Timeout
+    JOB_TIMEOUT                           = 30
+    CACHE_TTL, CACHE_MAXSIZE              = 3600, 1024
+    CACHE_FILE                            = "api_cache.sqlite"   # TMDB/TVDB-Antworten über Läufe hinweg
+    DISK_TTL_SHORT, DISK_TTL, DISK_TTL_LONG = 900, 86400, 604800  # Bundle/leer | Suche, Staffel/Episode | Rest
+    DISK_STALE                            = 86400    # abgelaufene Status/Videos noch so lange ausliefern (+ Refresh im Hintergrund)
     EMBED_STYLE                           = os.getenv("EMBED_STYLE", "boxed").lower() # boxed | telegram | klassisch
 
+    TVDB_TOKEN_FILE = "tvdb_token.json"
+    TVDB_TOKEN_TTL  = 82800                # 23 h, TVDB-Tokens gelten einen Monat
+
     RETRY_TOTAL = 3
     DISCORD_TIMEOUT = 15
 
+    # Sammel-Versand: Embeds, die innerhalb des Fensters eintreffen, gehen gemeinsam raus
+    DISCORD_QUEUE_FILE   = "pending_embeds.jsonl"
+    DISCORD_BATCH_WINDOW = float(os.getenv("DISCORD_BATCH_WINDOW", "3"))   # Sekunden, 0 = sofort
+    DISCORD_MAX_EMBEDS, DISCORD_MAX_CHARS = 10, 6000                       # Discord-Limits pro Nachricht
+
 INDENT       = " " * 6
 NBSP_INDENT  = INDENT.replace(" ", "\u00A0")
 ZWS          = "\u200B"
@@ -45,6 +70,21 @@ ZWS          = "\u200B"
 def log(level: str, msg: str):
     print(f"{level.upper():7} {msg}", file=sys.stderr if level in ("error", "warn") else sys.stdout)
 
+# ---- JSON (orjson, falls installiert) ----
+def json_loads(raw):
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def json_dumps(obj) -> bytes:
+    return orjson.dumps(obj) if orjson else json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+def json_line(obj) -> str:
+    """Eine JSONL-Zeile inkl. Newline – für Journal & Warteschlange."""
+    return json_dumps(obj).decode("utf-8") + "\n"
+
+def resp_json(resp):
+    """Ersatz für resp.json(): parst die rohen Bytes direkt."""
+    return json_loads(resp.content)
+
 # ---- Config-Prüfung ----
 def check_config():
     required = [
@@ -60,7 +100,7 @@ def check_config():
 
 check_config()
 
-# ---- Cross-Platform File-Lock für posted.json ----
+# ---- Cross-Platform File-Lock für posted.jsonl ----
 class FileLock:
     def __init__(self, path):
         self.path = path
@@ -93,218 +133,519 @@ class FileLock:
                 fcntl.flock(self._fd, fcntl.LOCK_UN)
             elif os.name == "nt":
                 import msvcrt
+                self._fd.seek(0)                # Lock sitzt auf Byte 0
                 msvcrt.locking(self._fd.fileno(), msvcrt.LK_UNLCK, 1)
             self.locked = False
             self._fd.close()
         self._lock.release()
 
-@contextlib.contextmanager
-def locked_posted_keys():
-    """JSON-Liste mit File-Lock cross-platform öffnen & pflegen."""
-    with FileLock(Config.POSTED_KEYS_FILE) as f:
+class PostedKeyStore:
+    """
+    Append-only Journal (JSON-Lines) der geposteten Einträge.
+    Jede Statusänderung ist eine neue Zeile, beim Lesen gewinnt pro rating_key die letzte.
+    Dupe-Check über Sets, Schreiben hängt nur eine Zeile an; erst ab doppelter
+    Maximalgröße wird das Journal auf POSTED_KEYS_MAX Einträge verdichtet.
+    """
+    def __init__(self, path: str, max_entries: int, legacy_path: Optional[str] = None):
+        self.path, self.max_entries, self.legacy_path = path, max_entries, legacy_path
+        self.entries: "OrderedDict[str, dict]" = OrderedDict()
+        self.rating_keys, self.signatures = set(), set()
+        self._lines = 0
+
+    def _read(self, f):
+        entries, lines = OrderedDict(), 0
+        f.seek(0)
+        for line in f.read().splitlines():
+            if not line.strip():
+                continue
+            try:
+                rec = json_loads(line)
+            except ValueError:
+                continue
+            lines += 1
+            rk = str(rec.get("rating_key"))
+            entries.pop(rk, None)
+            entries[rk] = rec
+        if not lines and self.legacy_path and os.path.exists(self.legacy_path):
+            entries = self._read_legacy()
+            lines = -1                          # erzwingt Neuschreiben im neuen Format
+        self.entries, self._lines = entries, lines
+        self.rating_keys = set(entries)
+        self.signatures = {e.get("signature") for e in entries.values()}
+
+    def _read_legacy(self) -> "OrderedDict[str, dict]":
         try:
-            f.seek(0)
-            raw = f.read().strip()
-            if not raw:
-                data = []
-            else:
-                try:
-                    data = json.loads(raw)
-                except (json.JSONDecodeError, ValueError, EOFError):
-                    data = []
-            yield data
-            f.seek(0)
-            json.dump(data[-Config.POSTED_KEYS_MAX:], f, indent=2)
-            f.truncate()
-        except Exception as e:
-            log("error", f"FileLock/JSON: {e}")
-            yield []
+            with open(self.legacy_path, encoding="utf-8") as lf:
+                data = json_loads(lf.read() or "[]")
+        except (OSError, ValueError) as e:
+            log("warn", f"{self.legacy_path} nicht lesbar: {e}")
+            data = []
+        return OrderedDict((str(d.get("rating_key")), d) for d in data if isinstance(d, dict))
+
+    def _compact(self, f):
+        keep = list(self.entries.values())[-self.max_entries:]
+        f.seek(0)
+        f.writelines(json_line(rec) for rec in keep)
+        f.truncate()
+        self._lines = len(keep)
+
+    def load(self) -> "PostedKeyStore":
+        with FileLock(self.path) as f:
+            self._read(f)
+        return self
+
+    def is_posted(self, rating_key: str, signature: Optional[str] = None) -> bool:
+        return str(rating_key) in self.rating_keys or (signature is not None and signature in self.signatures)
+
+    def claim(self, record: dict) -> bool:
+        """Prüft & trägt unter Lock ein – False, wenn rating_key oder Signatur schon bekannt sind."""
+        with FileLock(self.path) as f:
+            self._read(f)
+            if self.is_posted(record["rating_key"], record.get("signature")):
+                return False
+            self._write(f, record)
+        return True
+
+    def append(self, record: dict):
+        with FileLock(self.path) as f:
+            # Neu lesen wie in claim(): eine Verdichtung darf keine Zeilen paralleler Läufe verwerfen
+            self._read(f)
+            self._write(f, record)
+
+    def _write(self, f, record: dict):
+        rk = str(record["rating_key"])
+        self.entries.pop(rk, None)
+        self.entries[rk] = record
+        self.rating_keys.add(rk)
+        self.signatures.add(record.get("signature"))
+        if self._lines < 0 or self._lines >= 2 * self.max_entries:
+            self._compact(f)
+        else:
+            f.seek(0, os.SEEK_END)
+            f.write(json_line(record))
+            self._lines += 1
 
 # ─────────────────────────────────────────────────────────────
 # 2. HTTP-SESSION & API-CLIENTS (TAUTULLI, TMDB, TVDB)
 # ─────────────────────────────────────────────────────────────
 
 # ---- Gemeinsame Requests-Session mit HTTP-Adapter ----
+# Ein Keep-Alive-Pool pro Host (Tautulli, TMDB, TVDB, Discord), groß genug,
+# damit parallele Abfragen nicht auf freie Verbindungen warten bzw. neu verbinden.
+# Retry mit Backoff für 429/5xx (inkl. Retry-After); die letzte Antwort wird
+# zurückgegeben statt geworfen, damit .ok/.status_code wie gewohnt greifen.
+_RETRY_KW = dict(total=Config.RETRY_TOTAL, backoff_factor=0.5,
+                 status_forcelist=(429, 500, 502, 503, 504),
+                 respect_retry_after_header=True, raise_on_status=False)
+try:
+    retry = Retry(allowed_methods=frozenset(["GET", "POST"]), **_RETRY_KW)
+except TypeError:                           # urllib3 < 1.26 kennt nur method_whitelist
+    retry = Retry(method_whitelist=frozenset(["GET", "POST"]), **_RETRY_KW)
 session = requests.Session()
-adapter = requests.adapters.HTTPAdapter(max_retries=2, pool_maxsize=4)
+adapter = requests.adapters.HTTPAdapter(max_retries=retry,
+                                        pool_connections=Config.HTTP_POOL_HOSTS,
+                                        pool_maxsize=Config.HTTP_POOL_SIZE)
 session.mount("http://", adapter)
 session.mount("https://", adapter)
+# Webhook: 5xx/Timeouts wiederholt urllib3 (Backoff wie bisher 2s/4s). 429 bleibt bei post_to_discord –
+# Discord schickt gebrochene Retry-After-Werte ("0.5"), an denen urllib3 mit InvalidHeader scheitert
+session.mount(Config.WEBHOOK_URL, requests.adapters.HTTPAdapter(
+    max_retries=retry.new(total=Config.RETRY_TOTAL - 1, backoff_factor=1.0,
+                          status_forcelist=(500, 502, 503, 504), respect_retry_after_header=False),
+    pool_connections=1, pool_maxsize=2))
+# Keep-Alive-Verbindungen beim Beenden sauber schließen (Tautulli startet pro Event einen neuen Prozess)
+atexit.register(session.close)
 tget  = lambda url, **kw:  session.get(url,  timeout=kw.pop("timeout", Config.HTTP_TIMEOUT), **kw)
 tpost = lambda url, **kw: session.post(url, timeout=kw.pop("timeout", Config.HTTP_TIMEOUT), **kw)
 
+# ---- Thread-Pool für unabhängige API-Abfragen (teilt sich den Session-Pool) ----
+_POOL = ThreadPoolExecutor(max_workers=Config.MAX_WORKERS)
+
+def run_aside(fn, *args) -> Future:
+    """
+    Nebenabfrage in einem eigenen Thread – für Code, der selbst als _POOL-Job läuft.
+    Würde er auf einen weiteren _POOL-Job warten, könnten alle Worker aufeinander warten.
+    """
+    ex = ThreadPoolExecutor(max_workers=1)
+    try:
+        return ex.submit(fn, *args)
+    finally:
+        ex.shutdown(wait=False)             # Thread endet nach dem Job von selbst
+
+# ---- TTL-Cache (LRU) für idempotente GETs an TMDB/TVDB ----
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize, self.ttl = maxsize, ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            if hit[0] < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return hit[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.time() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+_TMDB_CACHE = TTLCache(Config.CACHE_MAXSIZE, Config.CACHE_TTL)
+_TVDB_CACHE = TTLCache(Config.CACHE_MAXSIZE, Config.CACHE_TTL)
+
+# ---- Persistenter Cache (SQLite) – hält API-Antworten über einzelne Trigger hinaus ----
+class DiskCache:
+    """Key → JSON mit Ablaufzeit (+ ETag). Fehler (gesperrte/kaputte DB) gelten als Cache-Miss."""
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()      # sqlite-Verbindungen nicht über Threads teilen
+        self._ready, self._ready_lock = False, threading.Lock()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            with self._ready_lock:
+                if not self._ready:         # Schema & Aufräumen einmal pro Prozess, nicht je Thread
+                    self._setup(conn)
+                    self._ready = True
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _setup(conn):
+        conn.execute("PRAGMA journal_mode=WAL")                     # bleibt in der Datei gesetzt
+        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires REAL, value BLOB, etag TEXT)")
+        with contextlib.suppress(sqlite3.OperationalError):         # Cache-Datei aus älterer Version
+            conn.execute("ALTER TABLE cache ADD COLUMN etag TEXT")
+        conn.execute("DELETE FROM cache WHERE expires < ?", (time.time() - Config.DISK_STALE,))
+
+    def entry(self, key: str) -> Optional[Tuple[Any, float, Optional[str]]]:
+        """(Wert, Ablaufzeit, ETag) – auch abgelaufen, bis DISK_STALE nach Ablauf aufgeräumt wird."""
+        try:
+            row = self._conn().execute("SELECT value, expires, etag FROM cache WHERE key = ?", (key,)).fetchone()
+            return (json_loads(row[0]), row[1], row[2]) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            log("warn", f"Cache lesen ({key}): {e}")
+            return None
+
+    def get(self, key: str):
+        hit = self.entry(key)
+        return hit[0] if hit and hit[1] >= time.time() else None
+
+    def set(self, key: str, value, ttl: int, etag: Optional[str] = None):
+        try:
+            self._conn().execute("INSERT OR REPLACE INTO cache (key, expires, value, etag) VALUES (?, ?, ?, ?)",
+                                 (key, time.time() + ttl, json_dumps(value), etag))
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            log("warn", f"Cache schreiben ({key}): {e}")
+
+    def touch(self, key: str, ttl: int):
+        """Nach 304 Not Modified: nur die Ablaufzeit verlängern."""
+        try:
+            self._conn().execute("UPDATE cache SET expires = ? WHERE key = ?", (time.time() + ttl, key))
+        except sqlite3.Error as e:
+            log("warn", f"Cache verlängern ({key}): {e}")
+
+_DISK_CACHE = DiskCache(Config.CACHE_FILE)
+
+def ttl_cached(cache: TTLCache, disk_ttl: int = 0):
+    """Cacht leere Ergebnisse (None/{}) bewusst nicht – Fehler werden beim nächsten Aufruf erneut versucht.
+    Mit disk_ttl landet das Ergebnis zusätzlich im persistenten Cache."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            key = (fn.__name__,) + args
+            val = cache.get(key)
+            if val is None and disk_ttl:
+                val = _DISK_CACHE.get(":".join(map(str, key)))
+                if val: cache.set(key, val)
+            if val is None:
+                val = fn(*args)
+                if val:
+                    cache.set(key, val)
+                    if disk_ttl: _DISK_CACHE.set(":".join(map(str, key)), val, disk_ttl)
+            return val
+        return wrapper
+    return deco
+
 # ---- Tautulli API Wrapper ----
 def tautulli_api(cmd: str, **params) -> dict:
     params.update({"apikey": Config.TAUTULLI_API_KEY, "cmd": cmd})
     try:
         r = tget(f"{Config.TAUTULLI_URL}/api/v2", params=params)
-        return r.json().get("response", {}).get("data", {}) if r.ok else {}
+        return resp_json(r).get("response", {}).get("data", {}) if r.ok else {}
     except Exception as e:
         log("error", f"Tautulli API {cmd}: {e}")
         return {}
 
+_META_CACHE = TTLCache(Config.CACHE_MAXSIZE, 60)      # kurz – Tautulli-Daten ändern sich direkt nach dem Hinzufügen
+
 def fetch_metadata(rating_key: str, include_children: int = 0) -> dict:
-    return tautulli_api("get_metadata", rating_key=rating_key, include_children=include_children)
+    """Pro Lauf nur ein GET je (rating_key, include_children); ein include_children-Abruf bedient beide."""
+    rk, inc = str(rating_key), int(include_children)
+    meta = _META_CACHE.get((rk, inc)) or (None if inc else _META_CACHE.get((rk, 1)))
+    if meta is None:
+        meta = tautulli_api("get_metadata", rating_key=rk, include_children=inc)
+        if meta: _META_CACHE.set((rk, inc), meta)
+    return meta
 
 def guess_latest_rating_key() -> Optional[str]:
     ra = tautulli_api("get_recently_added", count=1).get("recently_added", [])
     return str(ra[0]["rating_key"]) if ra else None
 
 # ---- TMDB API Wrapper ----
+_TMDB_VOLATILE_RE = re.compile(r"^(tv|movie)/\d+$")    # Basis-Bundle (inkl. Videos): Trailer und Serienstatus ändern sich
+_TMDB_SEASON_RE   = re.compile(r"^tv/\d+/season/\d+(/episode/\d+)?$")  # füllt TMDB nach der Ausstrahlung nach
+
+_TMDB_FINAL_STATUS = frozenset({"Ended", "Canceled", "Released"})      # hier ändert sich nichts mehr
+
+def tmdb_is_empty(data: dict) -> bool:
+    """Leere Suche/find-Antwort oder (noch) kein Overview – wie bei ttl_cached nicht lange festhalten."""
+    if "results" in data: return not data["results"]
+    finds = [v for k, v in data.items() if k.endswith("_results")]
+    if finds: return not any(finds)
+    return "overview" in data and not data["overview"]
+
+def tmdb_disk_ttl(path: str, data: Optional[dict] = None) -> int:
+    if isinstance(data, dict) and tmdb_is_empty(data): return Config.DISK_TTL_SHORT
+    if _TMDB_VOLATILE_RE.search(path):
+        # Abgeschlossene Serien / erschienene Filme: Status & Trailer bleiben stabil
+        if data and data.get("status") in _TMDB_FINAL_STATUS: return Config.DISK_TTL_LONG
+        return Config.DISK_TTL_SHORT
+    if path.startswith(("find/", "search/")) or _TMDB_SEASON_RE.match(path): return Config.DISK_TTL
+    return Config.DISK_TTL_LONG
+
+# Laufende Requests – parallele Aufrufer derselben URL (Titel, Plot, Link-Check) teilen sich eine Antwort
+_TMDB_INFLIGHT: Dict[tuple, Future] = {}
+_TMDB_INFLIGHT_LOCK = threading.Lock()
+
 def tmdb_get(path, params=None, timeout=None):
-    p = params or {}
-    p["api_key"] = Config.TMDB_API_KEY
+    p = dict(params or {})
+    key = (path, tuple(sorted(p.items())))
+    cached = _TMDB_CACHE.get(key)
+    if cached is not None:
+        return cached
+    with _TMDB_INFLIGHT_LOCK:
+        fut = _TMDB_INFLIGHT.get(key)
+        owner = fut is None
+        if owner:
+            fut = _TMDB_INFLIGHT[key] = Future()
+    if not owner:
+        return fut.result()
+    data = {}
     try:
-        r = tget(f"https://api.themoviedb.org/3/{path}", params=p, timeout=timeout or Config.TMDB_TIMEOUT)
-        if r.ok: return r.json()
+        data = _tmdb_fetch(path, p, key, timeout)
+    finally:
+        with _TMDB_INFLIGHT_LOCK:
+            del _TMDB_INFLIGHT[key]
+        fut.set_result(data)
+    return data
+
+def _tmdb_fetch(path, p, key, timeout):
+    disk_key = "tmdb:" + path + "?" + urllib.parse.urlencode(key[1])
+    hit, now = _DISK_CACHE.entry(disk_key), time.time()
+    if hit:
+        value, expires, _ = hit
+        if expires >= now:
+            _TMDB_CACHE.set(key, value)
+            return value
+        # Stale-while-revalidate: veraltete Status-/Video-Daten sofort liefern, im Hintergrund erneuern
+        if _TMDB_VOLATILE_RE.search(path) and expires + Config.DISK_STALE >= now:
+            _TMDB_CACHE.set(key, value)
+            _POOL.submit(_tmdb_http, path, p, key, disk_key, timeout, hit)
+            return value
+    return _tmdb_http(path, p, key, disk_key, timeout, hit)
+
+def _tmdb_http(path, p, key, disk_key, timeout, hit=None):
+    """GET gegen TMDB; mit vorhandenem ETag als Conditional GET (304 → gespeicherte Antwort)."""
+    p = dict(p, api_key=Config.TMDB_API_KEY)
+    headers = {"If-None-Match": hit[2]} if hit and hit[2] else None
+    try:
+        r = tget(f"https://api.themoviedb.org/3/{path}", params=p, headers=headers,
+                 timeout=timeout or Config.TMDB_TIMEOUT)
+        if r.status_code == 304 and hit:
+            _TMDB_CACHE.set(key, hit[0])
+            _DISK_CACHE.touch(disk_key, tmdb_disk_ttl(path, hit[0]))
+            return hit[0]
+        if r.ok:
+            data = resp_json(r)
+            _TMDB_CACHE.set(key, data)
+            _DISK_CACHE.set(disk_key, data, tmdb_disk_ttl(path, data), r.headers.get("ETag"))
+            return data
     except Exception as e:
         log("warn", f"TMDB GET {path}: {e}")
     return {}
 
-def tmdb_fetch_overview(tmdb_id: str, is_movie: bool) -> Optional[str]:
-    if not tmdb_id: return None
+def tmdb_get_full(tmdb_id: str, is_movie: bool) -> dict:
+    """
+    Film/Serie samt Credits, Videos, Bildern und Alternativtiteln in einem Request
+    (append_to_response) – Overview, Status, Trailer, Bild & Edition lesen nur daraus.
+    """
+    if not tmdb_id: return {}
     mtype = "movie" if is_movie else "tv"
-    data = tmdb_get(f"{mtype}/{tmdb_id}", params={"language": "de-DE"})
-    return data.get("overview")
+    return tmdb_get(f"{mtype}/{tmdb_id}", params={
+        "language": "de-DE", "append_to_response": "credits,videos,images,alternative_titles",
+        "include_video_language": "de,en,null", "include_image_language": "de,null,en"})
+
+def tmdb_fetch_overview(tmdb_id: str, is_movie: bool) -> Optional[str]:
+    return tmdb_get_full(tmdb_id, is_movie).get("overview")
 
 def tmdb_fetch_credits(tmdb_id: str, is_movie: bool) -> dict:
-    if not tmdb_id: return {}
-    mtype = "movie" if is_movie else "tv"
-    return tmdb_get(f"{mtype}/{tmdb_id}/credits", params={"language": "de-DE"})
+    return tmdb_get_full(tmdb_id, is_movie).get("credits") or {}
+
+def tmdb_get_episode(tmdb_id, season_num, episode_num) -> dict:
+    """
+    Episode (de-DE) samt aller Übersetzungen in einem Request – Titel und Plot
+    lesen daraus, statt je Sprache eine eigene Abfrage zu stellen.
+    """
+    if not tmdb_id or season_num is None or not episode_num: return {}
+    return tmdb_get(f"tv/{tmdb_id}/season/{season_num}/episode/{episode_num}",
+                    params={"language": "de-DE", "append_to_response": "translations"})
+
+_TRANSLATION_REGION = {"de": "DE", "en": "US"}     # bevorzugte Variante je Sprache (de-DE vor de-AT, en-US vor en-GB)
+
+def tmdb_episode_text(ep: dict, field: str, usable=bool) -> Optional[str]:
+    """Erstes brauchbares Feld: de-DE-Antwort → Übersetzungen de → Übersetzungen en (je Hauptregion zuerst)."""
+    trans: Dict[str, List[str]] = {"de": [], "en": []}
+    variants = (ep.get("translations") or {}).get("translations") or []
+    for t in sorted(variants, key=lambda t: t.get("iso_3166_1") != _TRANSLATION_REGION.get(t.get("iso_639_1"))):
+        val = (t.get("data") or {}).get(field)
+        if val and t.get("iso_639_1") in trans:
+            trans[t["iso_639_1"]].append(val)
+    for val in (ep.get(field), *trans["de"], *trans["en"]):
+        if val and usable(val): return val
+    return None
 
-def tmdb_fetch_episode_plot(tmdb_id, season_num, episode_num, lang="de-DE"):
-    if not tmdb_id or not season_num or not episode_num: return None
-    data = tmdb_get(f"tv/{tmdb_id}/season/{season_num}/episode/{episode_num}", params={"language": lang})
-    return data.get("overview")
+def tmdb_fetch_episode_plot(tmdb_id, season_num, episode_num):
+    return tmdb_episode_text(tmdb_get_episode(tmdb_id, season_num, episode_num), "overview")
+
+EDITION_RE = re.compile(
+    r"\b(extended cut|director'?s cut|special edition|unrated|ultimate edition|final cut|"
+    r"collector'?s edition|redux|restored|anniversary edition|imax|3d)\b",
+    re.I
+)
 
 def tmdb_fetch_edition(tmdb_id: str) -> Optional[str]:
-    if not tmdb_id: return None
-    data = tmdb_get(f"movie/{tmdb_id}/alternative_titles")
+    data = tmdb_get_full(tmdb_id, True).get("alternative_titles") or {}
     for t in data.get("titles", []):
-        low = t.get("title", "").lower()
-        for kw in [
-            "extended cut", "director's cut", "special edition", "unrated",
-            "ultimate edition", "final cut", "collector's edition", "redux",
-            "restored", "anniversary edition", "imax", "3d"
-        ]:
-            if kw in low:
-                m = re.search(rf"\b({kw})\b", low, flags=re.I)
-                return (m.group(1) if m else t["title"]).title()
+        m = EDITION_RE.search(t.get("title", ""))
+        if m:
+            return m.group(1).lower().title()
     return None
 
 # ---- TVDB API Wrapper inkl. Token-Caching ----
 TVDB_TOKEN_CACHE = {"token": None, "ts": 0}
+_TVDB_TOKEN_LOCK = threading.Lock()
+
+def _tvdb_token_valid(cache: dict) -> bool:
+    return bool(cache.get("token")) and time.time() - float(cache.get("ts") or 0) < Config.TVDB_TOKEN_TTL
+
+def _load_tvdb_token() -> bool:
+    """Token aus der Vorgänger-Instanz übernehmen – Tautulli startet das Skript pro Event neu."""
+    try:
+        with open(Config.TVDB_TOKEN_FILE, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if isinstance(data, dict) and _tvdb_token_valid(data):
+        TVDB_TOKEN_CACHE.update(token=data["token"], ts=float(data["ts"]))
+        return True
+    return False
+
+def _save_tvdb_token():
+    tmp = f"{Config.TVDB_TOKEN_FILE}.{os.getpid()}.tmp"
+    try:
+        # Bearer-Token nur für den Besitzer lesbar (0600) – os.replace übernimmt die Rechte der Temp-Datei
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(TVDB_TOKEN_CACHE, f)
+        os.replace(tmp, Config.TVDB_TOKEN_FILE)          # atomar, kein halbes File für Parallel-Läufe
+    except OSError as e:
+        log("warn", f"TVDB-Token speichern: {e}")
+
+def drop_tvdb_token():
+    with _TVDB_TOKEN_LOCK:
+        TVDB_TOKEN_CACHE.update(token=None, ts=0)
+        with contextlib.suppress(OSError):
+            os.remove(Config.TVDB_TOKEN_FILE)
+
 def get_tvdb_token():
-    if TVDB_TOKEN_CACHE["token"] and time.time() - TVDB_TOKEN_CACHE["ts"] < 82800:
-        return TVDB_TOKEN_CACHE["token"]
-    url = "https://api4.thetvdb.com/v4/login"
-    payload = {"apikey": Config.TVDB_API_KEY}
-    resp = tpost(url, json=payload)
-    resp.raise_for_status()
-    token = resp.json()["data"]["token"]
-    TVDB_TOKEN_CACHE["token"] = token
-    TVDB_TOKEN_CACHE["ts"] = time.time()
-    return token
+    with _TVDB_TOKEN_LOCK:                  # parallele Abfragen sollen nur einmal einloggen
+        if _tvdb_token_valid(TVDB_TOKEN_CACHE) or _load_tvdb_token():
+            return TVDB_TOKEN_CACHE["token"]
+        url = "https://api4.thetvdb.com/v4/login"
+        payload = {"apikey": Config.TVDB_API_KEY}
+        resp = tpost(url, json=payload)
+        resp.raise_for_status()
+        token = resp_json(resp)["data"]["token"]
+        TVDB_TOKEN_CACHE["token"] = token
+        TVDB_TOKEN_CACHE["ts"] = time.time()
+        _save_tvdb_token()
+        return token
+
+def _tvdb_data(path: str, headers: dict, **kw):
+    """GET auf TVDB v4, Body wird genau einmal geparst; liefert nur das "data"-Feld."""
+    resp = tget(f"https://api4.thetvdb.com/v4/{path}", headers=headers, **kw)
+    if resp.status_code == 401: drop_tvdb_token()      # gespeichertes Token abgelaufen/widerrufen
+    if not resp.ok:
+        return {}
+    try:
+        return resp_json(resp).get("data") or {}
+    except ValueError:
+        return {}
 
-def fetch_tvdb_episode_title(episode_id):
-    if not episode_id:
+def _tvdb_first_translation(kind: str, obj_id, field: str, fallback: Optional[str] = None) -> Optional[str]:
+    """
+    Fragt Deutsch, Englisch und das Original (kind: episodes | seasons | series)
+    gleichzeitig ab und liefert das erste befüllte Feld in dieser Reihenfolge.
+    Eigener Mini-Pool, da der Aufrufer selbst schon in _POOL laufen kann.
+    """
+    if not obj_id:
         return None
     try:
-        token = get_tvdb_token()
-        # 1. Versuche Deutsch
-        url = f"https://api4.thetvdb.com/v4/episodes/{episode_id}/translations/deu"
-        headers = {"Authorization": f"Bearer {token}"}
-        resp = tget(url, headers=headers)
-        if resp.ok and resp.json().get("data", {}).get("name"):
-            return resp.json()["data"]["name"]
-        # 2. Fallback Englisch
-        url = f"https://api4.thetvdb.com/v4/episodes/{episode_id}/translations/eng"
-        resp = tget(url, headers=headers)
-        if resp.ok and resp.json().get("data", {}).get("name"):
-            return resp.json()["data"]["name"]
-        # 3. Fallback: Original aus Episode
-        url = f"https://api4.thetvdb.com/v4/episodes/{episode_id}"
-        resp = tget(url, headers=headers)
-        if resp.ok and resp.json().get("data", {}).get("name"):
-            return resp.json()["data"]["name"]
+        headers = {"Authorization": f"Bearer {get_tvdb_token()}"}
+        paths = (f"{kind}/{obj_id}/translations/deu", f"{kind}/{obj_id}/translations/eng", f"{kind}/{obj_id}")
+
+        def fetch(path):
+            # Fehler je Pfad abfangen – ein Timeout beim Original darf den deutschen Treffer nicht verwerfen
+            try:
+                return _tvdb_data(path, headers)
+            except requests.RequestException as e:
+                log("warn", f"TVDB {path}: {e}")
+                return {}
+
+        with ThreadPoolExecutor(max_workers=len(paths)) as ex:
+            deu, eng, base = ex.map(fetch, paths)
+        return deu.get(field) or eng.get(field) or base.get(field) or (base.get(fallback) if fallback else None)
     except Exception as e:
-        log("warn", f"TVDB-Episode-Title: {e}")
+        log("warn", f"TVDB {kind}/{obj_id} ({field}): {e}")
     return None
 
+@ttl_cached(_TVDB_CACHE, Config.DISK_TTL_LONG)
+def fetch_tvdb_episode_title(episode_id):
+    return _tvdb_first_translation("episodes", episode_id, "name")
+
+@ttl_cached(_TVDB_CACHE, Config.DISK_TTL_LONG)
 def fetch_tvdb_episode_plot(episode_id):
-    if not episode_id:
-        return None
-    try:
-        token = get_tvdb_token()
-        # 1. Versuche Deutsch
-        url = f"https://api4.thetvdb.com/v4/episodes/{episode_id}/translations/deu"
-        headers = {"Authorization": f"Bearer {token}"}
-        resp = tget(url, headers=headers)
-        if resp.ok and resp.json().get("data", {}).get("overview"):
-            return resp.json()["data"]["overview"]
-        # 2. Fallback Englisch
-        url = f"https://api4.thetvdb.com/v4/episodes/{episode_id}/translations/eng"
-        resp = tget(url, headers=headers)
-        if resp.ok and resp.json().get("data", {}).get("overview"):
-            return resp.json()["data"]["overview"]
-        # 3. Fallback: Original aus Episode
-        url = f"https://api4.thetvdb.com/v4/episodes/{episode_id}"
-        resp = tget(url, headers=headers)
-        d = resp.json().get("data", {}) if resp.ok else {}
-        return d.get("overview") or d.get("summary")
-    except Exception as e:
-        log("warn", f"TVDB-Episode-Plot: {e}")
-    return None
+    return _tvdb_first_translation("episodes", episode_id, "overview", fallback="summary")
 
+@ttl_cached(_TVDB_CACHE, Config.DISK_TTL_LONG)
 def fetch_tvdb_season_plot(season_id):
-    if not season_id:
-        return None
-    try:
-        token = get_tvdb_token()
-        # 1. Versuche Deutsch
-        url = f"https://api4.thetvdb.com/v4/seasons/{season_id}/translations/deu"
-        headers = {"Authorization": f"Bearer {token}"}
-        resp = tget(url, headers=headers)
-        if resp.ok and resp.json().get("data", {}).get("overview"):
-            return resp.json()["data"]["overview"]
-        # 2. Fallback Englisch
-        url = f"https://api4.thetvdb.com/v4/seasons/{season_id}/translations/eng"
-        resp = tget(url, headers=headers)
-        if resp.ok and resp.json().get("data", {}).get("overview"):
-            return resp.json()["data"]["overview"]
-        # 3. Fallback: Original
-        url = f"https://api4.thetvdb.com/v4/seasons/{season_id}"
-        resp = tget(url, headers=headers)
-        d = resp.json().get("data", {}) if resp.ok else {}
-        return d.get("overview") or d.get("summary")
-    except Exception as e:
-        log("warn", f"TVDB-Season-Plot: {e}")
-    return None
+    return _tvdb_first_translation("seasons", season_id, "overview", fallback="summary")
 
+@ttl_cached(_TVDB_CACHE, Config.DISK_TTL_LONG)
 def fetch_tvdb_show_plot(series_id):
-    if not series_id:
-        return None
-    try:
-        token = get_tvdb_token()
-        # 1. Versuche Deutsch
-        url = f"https://api4.thetvdb.com/v4/series/{series_id}/translations/deu"
-        headers = {"Authorization": f"Bearer {token}"}
-        resp = tget(url, headers=headers)
-        if resp.ok and resp.json().get("data", {}).get("overview"):
-            return resp.json()["data"]["overview"]
-        # 2. Fallback Englisch
-        url = f"https://api4.thetvdb.com/v4/series/{series_id}/translations/eng"
-        resp = tget(url, headers=headers)
-        if resp.ok and resp.json().get("data", {}).get("overview"):
-            return resp.json()["data"]["overview"]
-        # 3. Fallback: Original
-        url = f"https://api4.thetvdb.com/v4/series/{series_id}"
-        resp = tget(url, headers=headers)
-        d = resp.json().get("data", {}) if resp.ok else {}
-        return d.get("overview") or d.get("summary")
-    except Exception as e:
-        log("warn", f"TVDB-Series-Plot: {e}")
-    return None
+    return _tvdb_first_translation("series", series_id, "overview", fallback="summary")
 
+@ttl_cached(_TVDB_CACHE, Config.DISK_TTL)
 def get_tvdb_artwork(series_id: str, kind: str = "fanart") -> Optional[str]:
     """
     kind: 'fanart' (Backdrop) oder 'poster'
@@ -313,11 +654,8 @@ def get_tvdb_artwork(series_id: str, kind: str = "fanart") -> Optional[str]:
     if not series_id:
         return None
     try:
-        token  = get_tvdb_token()
-        url    = f"https://api4.thetvdb.com/v4/artwork/series/{series_id}"
-        hdr    = {"Authorization": f"Bearer {token}"}
-        r      = tget(url, headers=hdr, params={"type": kind})
-        data   = r.json().get("data", []) if r.ok else []
+        hdr    = {"Authorization": f"Bearer {get_tvdb_token()}"}
+        data   = _tvdb_data(f"artwork/series/{series_id}", hdr, params={"type": kind})
         if data:
             fn = data[0]["fileName"].lstrip("/")
             return f"https://artworks.thetvdb.com/banners/{fn}"
@@ -325,7 +663,10 @@ def get_tvdb_artwork(series_id: str, kind: str = "fanart") -> Optional[str]:
         log("warn", f"TVDB Artwork ({kind}): {e}")
     return None
 
-# ---- Umbruch Zeile 2 an richtiger Stelle ----    
+# ---- Umbruch Zeile 2 an richtiger Stelle ----
+_SUBTITLE_BREAK_RE  = re.compile(r"([\-:|.,])|\s")
+_SUBTITLE_PREFIX_RE = re.compile(r"^(.+?:\s*)")
+
 def smart_linebreak_subtitle(text: str,
                              maxlen: int = 40,
                              minlen: int = 36,
@@ -342,7 +683,7 @@ def smart_linebreak_subtitle(text: str,
     if text.startswith(prefix):
         real_prefix = prefix
     else:
-        m = re.match(r"^(.+?:\s*)", text)
+        m = _SUBTITLE_PREFIX_RE.match(text)
         real_prefix = m.group(1) if m else ""
 
     indent = " " * len(real_prefix)                    # gleichbreite Einrückung
@@ -351,19 +692,19 @@ def smart_linebreak_subtitle(text: str,
     max_body = maxlen - len(real_prefix)
     min_body = max(0,  minlen - len(real_prefix))
 
-    # 1️⃣  Kandidaten: Sonderzeichen im Zielfenster 36-40
-    split_pos = -1
-    for m in re.finditer(r"[\-:|.,]", body):
-        pos = m.end()
-        if min_body <= pos <= max_body:
-            split_pos = pos                            # größter Treffer gewinnt
-
-    # 2️⃣  Kandidaten: letztes Leerzeichen im Zielfenster
-    if split_pos == -1:
-        for m in re.finditer(r"\s", body):
+    # 1️⃣ / 2️⃣  Ein Durchlauf: Sonderzeichen (hinter dem Zeichen) bzw.
+    #          Leerzeichen (vor dem Zeichen) im Zielfenster 36-40 – größter Treffer gewinnt
+    best_special = best_space = -1
+    for m in _SUBTITLE_BREAK_RE.finditer(body):
+        if m.group(1):
+            pos = m.end()
+            if min_body <= pos <= max_body:
+                best_special = pos
+        else:
             pos = m.start()
             if min_body <= pos <= max_body:
-                split_pos = pos
+                best_space = pos
+    split_pos = best_special if best_special != -1 else best_space
 
     # 3️⃣  Fallback: letztes Leerzeichen vor max_body
     if split_pos == -1:
@@ -387,48 +728,111 @@ def smart_linebreak_subtitle(text: str,
 safe_int     = lambda v, d=0: int(v) if str(v).isdigit() else d
 indent_block = lambda txt: ZWS + "\n".join(f"{NBSP_INDENT}{l}" for l in txt.splitlines())
 
+def first(keys, *dicts):
+    """Erster truthy Wert – Dicts in Reihenfolge (Item → Staffel → Serie), je Dict alle Key-Aliase."""
+    if isinstance(keys, str): keys = (keys,)
+    for d in dicts:
+        for k in keys:
+            v = d.get(k)
+            if v: return v
+    return None
+
+@functools.lru_cache(maxsize=1024)
+def format_date(iso: str) -> str:
+    """'YYYY-MM-DD' → 'DD.MM.YYYY' per Split; nur abweichende Formate gehen über strptime."""
+    parts = iso.split("-")
+    if len(parts) == 3 and len(parts[0]) == 4 and len(parts[1]) == len(parts[2]) == 2:
+        return f"{parts[2]}.{parts[1]}.{parts[0]}"
+    return datetime.strptime(iso, "%Y-%m-%d").strftime("%d.%m.%Y")
+
+@functools.lru_cache(maxsize=1)
+def footer_stamp(minute: int) -> str:
+    """Footer-Zeitstempel, minutengenau – Embeds derselben Minute teilen sich den String."""
+    return datetime.fromtimestamp(minute * 60).strftime("%d.%m.%Y, %H:%M")
+
+# ---- Vorkompilierte Muster für Text-Utilities ----
+_RE_BR_PIPE  = re.compile(r"(<br\s*/?>|\|)", re.I)
+_RE_WS       = re.compile(r"[\s\u00A0\u2000-\u200B\u202F\u205F\u3000]+")
+_RE_SPACES   = re.compile(r"\s+")
+_RE_YEAR     = re.compile(r"\s*\(\d{4}\)")
+_RE_SXXEYY   = re.compile(r"S\d{1,2}E\d{1,2}", re.I)
+_RE_SE_CODES = re.compile(r"(S\d{1,2}E\d{1,2}|S\d{1,2}|E\d{1,2})", re.I)
+_RE_EP_WORDS = re.compile(r"\b(staffel|season|folge|episode|ep|teil|volume|chapter|tba|tbd)\b", re.I)
+_RE_PUNCT    = re.compile(r"[#:–\-|•]")
+
 def normalize_plot_text(txt: str) -> str:
     txt = html.unescape(txt or "")
-    txt = re.sub(r"(<br\s*/?>|\|)", " ", txt, flags=re.I)
-    txt = re.sub(r"[\s\u00A0\u2000-\u200B\u202F\u205F\u3000]+", " ", txt)
+    txt = _RE_BR_PIPE.sub(" ", txt)
+    txt = _RE_WS.sub(" ", txt)
     return txt.strip()
 
 def insert_line_breaks(txt: str, max_len=Config.MAX_LINE_LEN, max_lines=Config.MAX_LINES) -> str:
-    words, lines, cur = txt.split(), [], ""
-    for w in words:
-        if len(w) > Config.MAX_WORD_SPLIT_LEN:
-            while len(w) > max_len:
+    # Wörter sammeln statt String-Konkatenation; cur_len = Länge inkl. je einem Leerzeichen pro Wort
+    lines, cur, cur_len = [], [], 0
+    for w in txt.split():
+        lw = len(w)
+        if lw > Config.MAX_WORD_SPLIT_LEN:
+            i, step = 0, max_len - 1
+            while lw - i > max_len:
                 if len(lines) >= max_lines: return "\n".join(lines)
-                lines.append(w[:max_len - 1] + "-"); w = w[max_len - 1:]
-            cur += w + " "
-        elif len(cur) + len(w) + 1 > max_len:
+                lines.append(w[i:i + step] + "-"); i += step
+            cur.append(w[i:]); cur_len += lw - i + 1
+        elif cur_len + lw + 1 > max_len:
             if len(lines) >= max_lines: return "\n".join(lines)
-            lines.append(cur.rstrip()); cur = w + " "
+            lines.append(" ".join(cur)); cur, cur_len = [w], lw + 1
         else:
-            cur += w + " "
+            cur.append(w); cur_len += lw + 1
         if len(lines) >= max_lines: return "\n".join(lines)
-    if cur and len(lines) < max_lines: lines.append(cur.rstrip())
+    if cur and len(lines) < max_lines: lines.append(" ".join(cur))
     return "\n".join(lines)
 
 def strip_year_codes(t: str) -> str:
-    t = re.sub(r"\s*\(\d{4}\)", "", t)
-    t = re.sub(r"S\d{1,2}E\d{1,2}", "", t, flags=re.I)
+    t = _RE_YEAR.sub("", t)
+    t = _RE_SXXEYY.sub("", t)
     return t.strip(" -–:|")
 
+_CJK_RANGES = (
+    (0x2E80, 0x2EFF),     # CJK-Radikale
+    (0x3040, 0x30FF),     # Hiragana, Katakana
+    (0x31C0, 0x31FF),     # CJK-Striche, Katakana-Erweiterung
+    (0x3400, 0x4DBF),     # CJK-Erweiterung A
+    (0x4E00, 0x9FFF),     # CJK-Ideogramme
+    (0xF900, 0xFAFF),     # CJK-Kompatibilität
+    (0x20000, 0x3134F),   # CJK-Erweiterungen B–G
+)
+
+_RE_NON_LATIN = re.compile("[" + "".join(f"{chr(lo)}-{chr(hi)}" for lo, hi in _CJK_RANGES) + "]")
+_RE_NON_ASCII = re.compile(r"[^\x00-\x7f]")      # statt str.isascii() (erst ab Python 3.7)
+
+@functools.lru_cache(maxsize=2048)
 def is_non_latin(text):
-    if not text: return False
-    count = sum(1 for c in text if unicodedata.name(c, "").startswith(("CJK", "HIRAGANA", "KATAKANA")))
-    return count > 3
+    """Mehr als 3 CJK-/Kana-Zeichen → Titel gilt als nicht-lateinisch (Zählung in der Regex-Engine)."""
+    if not text or not _RE_NON_ASCII.search(text): return False
+    return len(_RE_NON_LATIN.findall(text)) > 3
 
 def clean_generic_phrases(t: str) -> str:
     t = html.unescape(t or "")
-    t = re.sub(r"(S\d{1,2}E\d{1,2}|S\d{1,2}|E\d{1,2})", "", t, flags=re.I)
-    t = re.sub(r"(?i)\b(staffel|season|folge|episode|ep|teil|volume|chapter|tba|tbd)\b", "", t)
-    t = re.sub(r"(?i)[#:–\-|•]", "", t)
-    t = re.sub(r"\s+", " ", t)
+    t = _RE_SE_CODES.sub("", t)
+    t = _RE_EP_WORDS.sub("", t)
+    t = _RE_PUNCT.sub("", t)
+    t = _RE_SPACES.sub(" ", t)
     return t.strip(" -–:|")
 
 # ---- Media-Typ & Nummernlogik ----
+def cached_on_item(fn):
+    """
+    Merkt sich das Ergebnis reiner Item-Funktionen im Item-Dict selbst
+    (Dicts sind nicht hashbar) – Titel, Links, Dupe-Check & Embed fragen dieselben Werte ab.
+    """
+    key = f"_cached_{fn.__name__}"
+    @functools.wraps(fn)
+    def wrapper(item):
+        if key not in item:
+            item[key] = fn(item)
+        return item[key]
+    return wrapper
+
+@cached_on_item
 def detect_media_type(item: dict) -> str:
     mt = (item.get("media_type") or "").lower()
     if mt in {"movie", "season", "episode"}:
@@ -440,6 +844,7 @@ def detect_media_type(item: dict) -> str:
     return "show"
 
 
+@cached_on_item
 def get_season_number(item) -> int:
     mt = item.get("media_type", "").lower()
     if mt == "season":
@@ -450,10 +855,11 @@ def get_season_number(item) -> int:
         return int(item.get("parent_media_index") or item.get("index") or 0)
 
 # ---- Duplikat-Signatur (unique Key pro Eintrag) ----
+@cached_on_item
 def build_dupe_signature(item: Dict) -> str:
     mt   = item.get("media_type", "").lower()
-    tit  = (item.get("title") or item.get("parent_title") or item.get("grandparent_title") or "").strip().lower()
-    year = str(item.get("year") or item.get("originally_available_at") or "")
+    tit  = (first(("title", "parent_title", "grandparent_title"), item) or "").strip().lower()
+    year = str(first(("year", "originally_available_at"), item) or "")
     season = str(get_season_number(item))
     epi    = str(item.get("media_index") or "")
     if   mt == "movie":   return f"movie::{tit}::{year}"
@@ -466,59 +872,58 @@ def build_dupe_signature(item: Dict) -> str:
 def collect_guids(meta: dict) -> List[str]:
     return (meta.get("guids") or []) + (meta.get("parent_guids") or []) + (meta.get("grandparent_guids") or [])
 
-def _extract_guid(guids: List[str], prefix: str) -> Optional[str]:
-    for g in guids:
-        m = re.match(rf"{prefix}://(\d+)", g)
-        if m:
-            return m.group(1)
-    return None
+@cached_on_item
+def parse_guids(meta: dict) -> Dict[str, str]:
+    """{scheme: erste numerische ID} – wird pro Metadaten-Dict nur einmal geparst."""
+    out: Dict[str, str] = {}
+    for g in collect_guids(meta):
+        scheme, sep, val = g.partition("://")
+        if sep and val.isdigit():
+            out.setdefault(scheme, val)
+    return out
+
+def index_guids(item: dict, season_meta: Optional[dict] = None, series_meta: Optional[dict] = None) -> Dict[str, List[Optional[str]]]:
+    """
+    Fasst die GUIDs zu {scheme: [id_item, id_season, id_series]} zusammen
+    (jeweils erster Treffer pro Quelle) – statt die Listen je Präfix neu zu scannen.
+    """
+    out: Dict[str, List[Optional[str]]] = {}
+    for slot, meta in enumerate((item, season_meta, series_meta)):
+        if not meta:
+            continue
+        for scheme, val in parse_guids(meta).items():
+            out.setdefault(scheme, [None, None, None])[slot] = val
+    return out
+
+def guid_id(ids: Dict[str, List[Optional[str]]], scheme: str, series_first: bool = False) -> Optional[str]:
+    vals = ids.get(scheme) or ()
+    return next((v for v in (reversed(vals) if series_first else vals) if v), None)
 
 # ---- TVDB- / TMDB-IDs (kompakt & robust) -------------------------------------------
-gx = lambda lst, pre: _extract_guid([g for g in lst if g.startswith(f"{pre}://")], pre)
-
-def get_tvdb_series_id(item, season_meta={}, series_meta={}):
-    # Suche Serie-ID in ALLEN relevanten Feldern
-    for m in (series_meta, season_meta, item):
-        for src in ["guids", "parent_guids", "grandparent_guids"]:
-            sid = gx(m.get(src, []), "tvdb")
-            if sid:
-                return sid
-    return None
-
-def get_tvdb_episode_id(item, season_meta={}, series_meta={}):
-    # Suche Episode-ID in ALLEN relevanten Feldern
-    all_guids = (
-        item.get("guids", []) +
-        item.get("parent_guids", []) +
-        item.get("grandparent_guids", []) +
-        season_meta.get("guids", []) +
-        season_meta.get("parent_guids", []) +
-        series_meta.get("guids", []) +
-        series_meta.get("parent_guids", [])
-    )
-    ep_id = gx(all_guids, "tvdb-episode")
+def get_tvdb_series_id(item, season_meta=None, series_meta=None, ids=None):
+    # Serie-ID: Serie vor Staffel vor Item
+    ids = ids or index_guids(item, season_meta, series_meta)
+    return guid_id(ids, "tvdb", series_first=True)
+
+def get_tvdb_episode_id(item, season_meta=None, series_meta=None, ids=None):
+    ids = ids or index_guids(item, season_meta, series_meta)
+    ep_id = guid_id(ids, "tvdb-episode")
     if ep_id:
         return ep_id
     # Fallback: manchmal steckt sie als "tvdb://<epid>", solange sie nicht der Serien-ID entspricht
-    fallback_id = gx(all_guids, "tvdb")
-    series_id = get_tvdb_series_id(item, season_meta, series_meta)
-    if fallback_id and fallback_id != series_id:
+    fallback_id = guid_id(ids, "tvdb")
+    if fallback_id and fallback_id != guid_id(ids, "tvdb", series_first=True):
         return fallback_id
     return None
 
-def get_tvdb_season_id(item, season_meta={}, series_meta={}):
-    # Suche Season-ID in ALLEN relevanten Feldern
-    all_guids = (
-        collect_guids(item) + collect_guids(season_meta) +
-        collect_guids(series_meta)
-    )
-    season_id = gx(all_guids, "tvdb-season")
+def get_tvdb_season_id(item, season_meta=None, series_meta=None, ids=None):
+    ids = ids or index_guids(item, season_meta, series_meta)
+    season_id = guid_id(ids, "tvdb-season")
     if season_id:
         return season_id
     # Fallback wie oben
-    fallback_id = gx(all_guids, "tvdb")
-    series_id = get_tvdb_series_id(item, season_meta, series_meta)
-    if fallback_id and fallback_id != series_id:
+    fallback_id = guid_id(ids, "tvdb")
+    if fallback_id and fallback_id != guid_id(ids, "tvdb", series_first=True):
         return fallback_id
     return None
 
@@ -532,11 +937,17 @@ def search_tmdb_tv_by_name(name: str, year: Optional[str] = None):
     r = tmdb_get("search/tv", params=q)
     return str(r["results"][0]["id"]) if r and r.get("results") else None
 
-def get_tmdb_id(item, series_meta={}, season_meta={}):
-    g = collect_guids(series_meta) + collect_guids(season_meta) + collect_guids(item)
-    tmdb = gx(g, "tmdb")
+def get_tmdb_id(item, series_meta=None, season_meta=None, ids=None):
+    """
+    TMDB-ID über GUIDs → TVDB-find → Namenssuche. Das Ergebnis wird wie bei
+    cached_on_item im Item-Dict abgelegt – Titel, Embed & Status fragen dieselbe ID ab.
+    """
+    if "_cached_get_tmdb_id" in item: return item["_cached_get_tmdb_id"]
+    series_meta = series_meta or {}
+    ids = ids or index_guids(item, season_meta, series_meta)
+    tmdb = guid_id(ids, "tmdb", series_first=True)
     if not tmdb:
-        tvdb = gx(g, "tvdb")
+        tvdb = guid_id(ids, "tvdb", series_first=True)
         if tvdb: tmdb = resolve_tmdb_from_tvdb(tvdb)
     if not tmdb and item.get("media_type", "").lower() in {"show", "series", "season", "episode", "tvshow"}:
         tmdb = search_tmdb_tv_by_name(
@@ -547,27 +958,28 @@ def get_tmdb_id(item, series_meta={}, season_meta={}):
             "query": (item.get("title") or "").strip(),
             "year": str(item.get("year") or ""), "language": "de-DE"})
         tmdb = str(r["results"][0]["id"]) if r and r.get("results") else None
+    item["_cached_get_tmdb_id"] = tmdb
     return tmdb
 
-def build_tvdb_link(item, season_meta={}, series_meta={}):
+_SLUG_TABLE = str.maketrans({" ": "-", "_": "-"})
+
+def build_tvdb_link(item, season_meta=None, series_meta=None, ids=None):
     """
     Gibt den besten TVDB-Link für Serie, Staffel oder Episode zurück.
     Benutzt Slug, Staffelnummer und Episode-ID, wenn möglich.
     Fällt auf /episode/<epid> zurück, falls kein Slug.
     """
+    series_meta = series_meta or {}
     # Slug bestimmen (original_title oder slug aus Metadaten; Plex: "original_title", "slug" oder "grandparent_slug")
-    slug = (
-        item.get("slug") or item.get("parent_slug") or item.get("grandparent_slug") or
-        series_meta.get("slug") or series_meta.get("original_title") or
-        series_meta.get("slug") or item.get("original_title")
-    )
+    slug = (first(("slug", "parent_slug", "grandparent_slug"), item) or
+            first(("slug", "original_title"), series_meta) or item.get("original_title"))
     if slug:
-        slug = str(slug).replace(" ", "-").replace("_", "-").lower()
+        slug = str(slug).translate(_SLUG_TABLE).lower()
 
     mt = item.get("media_type", "").lower()
-    tvdb_ep_id = get_tvdb_episode_id(item, season_meta, series_meta)
-    tvdb_season_id = get_tvdb_season_id(item, season_meta, series_meta)
-    tvdb_series_id = get_tvdb_series_id(item, season_meta, series_meta)
+    ids = ids or index_guids(item, season_meta, series_meta)
+    tvdb_ep_id = get_tvdb_episode_id(item, season_meta, series_meta, ids)
+    tvdb_series_id = get_tvdb_series_id(item, season_meta, series_meta, ids)
     s_idx = get_season_number(item)
 
     if mt == "episode" and tvdb_ep_id:
@@ -586,19 +998,23 @@ def build_tvdb_link(item, season_meta={}, series_meta={}):
     return None
 
 # ---- Bild-Logik (TMDB Poster/Backdrop/Placeholder) ----
+def get_tmdb_images(tmdb_id: str, is_movie: bool) -> dict:
+    """Backdrops und Poster aus dem gebündelten Detail-Request."""
+    return tmdb_get_full(tmdb_id, is_movie).get("images") or {}
+
+def _tmdb_backdrop_url(images: dict) -> Optional[str]:
+    bd = images.get("backdrops") or []
+    return "https://image.tmdb.org/t/p/w780" + bd[0]["file_path"] if bd else None
+
+def _tmdb_poster_url(images: dict) -> Optional[str]:
+    po = images.get("posters") or []
+    return "https://image.tmdb.org/t/p/w500" + po[0]["file_path"] if po else None
+
 def get_tmdb_backdrop(tmdb_id: str, is_movie: bool) -> Optional[str]:
-    mtype = "movie" if is_movie else "tv"
-    data = tmdb_get(f"{mtype}/{tmdb_id}/images", params={"include_image_language": "de,null,en"})
-    if data and data.get("backdrops"):
-        return "https://image.tmdb.org/t/p/w780" + data["backdrops"][0]["file_path"]
-    return None
+    return _tmdb_backdrop_url(get_tmdb_images(tmdb_id, is_movie))
 
 def get_tmdb_poster(tmdb_id: str, is_movie: bool) -> Optional[str]:
-    mtype = "movie" if is_movie else "tv"
-    data = tmdb_get(f"{mtype}/{tmdb_id}/images", params={"include_image_language": "de,null,en"})
-    if data and data.get("posters"):
-        return "https://image.tmdb.org/t/p/w500" + data["posters"][0]["file_path"]
-    return None
+    return _tmdb_poster_url(get_tmdb_images(tmdb_id, is_movie))
 
 def choose_image(tmdb_id: str,
                  tvdb_series_id: str,
@@ -608,37 +1024,38 @@ def choose_image(tmdb_id: str,
     Reihenfolge:
     TMDB-Backdrop → TMDB-Poster → TVDB-Fanart → TVDB-Poster → Placeholder
     """
-    # 1) TMDB
+    # 1) TMDB – ein Request, Backdrop/Poster lokal auswählen
     if tmdb_id:
+        images = get_tmdb_images(tmdb_id, is_movie)
         if style != "telegram":
-            img = (get_tmdb_backdrop(tmdb_id, is_movie)
-                   or get_tmdb_poster(tmdb_id, is_movie))
+            img = _tmdb_backdrop_url(images) or _tmdb_poster_url(images)
         else:                               # Telegram-Embed will Poster
-            img = get_tmdb_poster(tmdb_id, is_movie)
+            img = _tmdb_poster_url(images)
         if img:
             return img
 
-    # 2) TVDB
+    # 2) TVDB – erst, wenn TMDB nichts liefert; Fanart & Poster parallel
     if tvdb_series_id:
-        img = (get_tvdb_artwork(tvdb_series_id, "fanart")
-               or get_tvdb_artwork(tvdb_series_id, "poster"))
+        poster = run_aside(get_tvdb_artwork, tvdb_series_id, "poster")
+        img = get_tvdb_artwork(tvdb_series_id, "fanart") or poster.result()
         if img:
             return img
 
     # 3) Fallback
     return Config.PLACEHOLDER_IMG
 
-# ---- Dummy-Episodentitel: Regex/Set für generische Titel ----
+# ---- Dummy-Episodentitel: eine Regex für Präfixe & Platzhalter ----
 GENERIC_EP_TITLE = re.compile(
-    r"^(folge|episode|ep|teil|chapter)\b.*$|^(tba|tbd|unknown|unbekannt|no title|n\.a\.|not available)$",
+    r"^(folge|episode|ep|teil|chapter)\b|^(tba|tbd|unknown|unbekannt|no title|n\.a\.|not available)$",
     re.I
 )
-DUMMY_EP_TITLES = {
-    "tba", "tbd", "unknown", "unbekannt", "no title", "n.a.", "not available"
-}
+
+def is_generic_title(t: Optional[str]) -> bool:
+    """Leer, zu kurz, 'Folge 3'/'TBA' o.ä. oder überwiegend CJK → kein brauchbarer Episodentitel."""
+    return not t or len(t) < 2 or bool(GENERIC_EP_TITLE.match(t)) or is_non_latin(t)
 
 # ---- Titel-Generator mit Fallback für Episoden ----
-def build_title(item: Dict, season_meta: dict = {}, series_meta: dict = {}) -> str:
+def build_title(item: Dict, season_meta: Optional[dict] = None, series_meta: Optional[dict] = None) -> str:
     mt   = item.get("media_type", "").lower()
     tit  = (item.get("title") or "").strip()
     ptit = (item.get("parent_title") or "").strip()
@@ -651,42 +1068,31 @@ def build_title(item: Dict, season_meta: dict = {}, series_meta: dict = {}) -> s
     if mt == "episode":
         title_candidates = [clean_title]
         # Prüfe Plex-Title (generisch? - alles was mit folge/episode/ep/teil beginnt, egal ob mit oder ohne Zahl)
-        if (
-            GENERIC_EP_TITLE.match(clean_title)
-            or clean_title.lower() in DUMMY_EP_TITLES
-            or is_non_latin(clean_title)
-            or len(clean_title) < 2
-        ):
+        if is_generic_title(clean_title):
+            # TVDB-Titel schon vorab anfragen – läuft parallel zur TMDB-Kette
+            ids = index_guids(item, season_meta, series_meta)
+            tvdb_ep_id = get_tvdb_episode_id(item, season_meta, series_meta, ids)
+            tvdb_future = run_aside(fetch_tvdb_episode_title, tvdb_ep_id) if tvdb_ep_id else None
             # 2. TMDB-Titel holen
-            tmdb_id = get_tmdb_id(item, series_meta, season_meta)
+            tmdb_id = get_tmdb_id(item, series_meta, season_meta, ids)
             s_idx = get_season_number(item)
             e_idx = safe_int(item.get("media_index"))
             tmdb_title = None
             if tmdb_id:
-                tmdb_title = tmdb_get(f"tv/{tmdb_id}/season/{s_idx}/episode/{e_idx}", params={"language": "de-DE"}).get("name")
+                tmdb_title = tmdb_episode_text(tmdb_get_episode(tmdb_id, s_idx, e_idx), "name",
+                                               lambda t: not is_generic_title(t))
             if tmdb_title:
                 title_candidates.append(tmdb_title)
             # Prüfe TMDB-Title (generisch?)
-            if not tmdb_title or (
-                GENERIC_EP_TITLE.match(tmdb_title)
-                or tmdb_title.lower() in DUMMY_EP_TITLES
-                or is_non_latin(tmdb_title)
-                or len(tmdb_title) < 2
-            ):
-                # 3. TVDB-Titel holen
-                tvdb_ep_id = get_tvdb_episode_id(item, season_meta, series_meta)
-                if tvdb_ep_id:
-                    tvdb_title = fetch_tvdb_episode_title(tvdb_ep_id)
+            if is_generic_title(tmdb_title):
+                # 3. TVDB-Titel übernehmen
+                if tvdb_future:
+                    tvdb_title = tvdb_future.result()
                     if tvdb_title:
                         title_candidates.append(tvdb_title)
         # Wähle ersten non-generic Titel aus der Kette
         for cand in title_candidates:
-            if cand and not (
-                GENERIC_EP_TITLE.match(cand)
-                or cand.lower() in DUMMY_EP_TITLES
-                or is_non_latin(cand)
-                or len(cand) < 2
-            ):
+            if not is_generic_title(cand):
                 clean_title = cand
                 break
 
@@ -724,107 +1130,99 @@ def build_title(item: Dict, season_meta: dict = {}, series_meta: dict = {}) -> s
 # ─────────────────────────────────────────────────────────────
 
 # ---- Sprache & Subs-Parsing ----
+_AUDIO_TAG_RE = re.compile(r"\[([A-Za-z]{2}(?:\+[A-Za-z]{2})*)\]")     # "[de+en]" im Dateinamen
+
 def get_language_lists(item: dict) -> Tuple[List[str], List[str]]:
+    """Audio-/Untertitelsprachen ohne Duplikate, in der Reihenfolge der Streams."""
     audio, subs, parts = [], [], []
+    by_type = {2: audio, 3: subs}
     for mi in item.get("media_info", []):
         parts.extend(mi.get("parts", []))
     for p in parts:
         for st in p.get("streams", []):
-            typ = int(st.get("type", 0))
-            lang = st.get("languageCode") or st.get("subtitle_language_code") or st.get("language")
-            if not lang: continue
-            lang = lang.lower()
-            if typ == 2: audio.append(lang)
-            if typ == 3: subs.append(lang)
+            target = by_type.get(int(st.get("type", 0)))
+            if target is None: continue
+            lang = first(("languageCode", "subtitle_language_code", "language"), st)
+            if lang: target.append(lang.lower())
     if not audio:
         for p in parts:
-            m = re.search(r"\[([A-Za-z]{2}(?:\+[A-Za-z]{2})*)\]", p.get("file", ""))
+            m = _AUDIO_TAG_RE.search(p.get("file", ""))
             if m:
-                audio = [c.lower() for c in m.group(1).split("+")]; break
-    return sorted(set(audio)), sorted(set(subs))
+                audio = m.group(1).lower().split("+"); break
+    return list(dict.fromkeys(audio)), list(dict.fromkeys(subs))
 
 # ---- Codec/Auflösung/Studio ----
-def find_codec_res(obj: Any) -> Tuple[str, str]:
-    if isinstance(obj, dict):
-        codec = obj.get("video_codec") or obj.get("stream_video_codec")
-        res   = (obj.get("video_resolution") or obj.get("video_full_resolution") or
-                 obj.get("stream_video_resolution"))
-        if codec or res:
-            if isinstance(res, str) and res.isdigit():
-                res = f"{res}p"
-            elif isinstance(res, str) and "x" in res:
-                h = res.split("x")[-1]
-                if h.isdigit():
-                    res = f"{h}p"
-            return str(codec).upper(), str(res)
-        for v in obj.values():
-            cc, rr = find_codec_res(v)
-            if cc or rr: return cc, rr
-    elif isinstance(obj, list):
-        for v in obj:
-            cc, rr = find_codec_res(v)
-            if cc or rr: return cc, rr
+_RES_RE = re.compile(r"^(\d+)p?$|x(\d+)$")        # "1080", "1080p" oder "1920x1080"
+
+# Reihenfolge = Priorität, daher Tupel statt Sets
+_CODEC_KEYS = ("video_codec", "stream_video_codec", "videoCodec")
+_RES_KEYS   = ("video_resolution", "video_full_resolution", "stream_video_resolution", "videoResolution")
+
+def _codec_res_at(node: dict) -> Optional[Tuple[str, str]]:
+    codec = next((node[k] for k in _CODEC_KEYS if node.get(k)), None)
+    res   = next((node[k] for k in _RES_KEYS if node.get(k)), None)
+    if not (codec or res):
+        return None
+    m = _RES_RE.search(res) if isinstance(res, str) else None
+    if m: res = f"{m.group(1) or m.group(2)}p"
+    return str(codec).upper(), str(res)
+
+def find_codec_res(obj: Any, max_depth: int = 3) -> Tuple[str, str]:
+    """
+    Erst die bekannten Stellen (oberste Ebene, media_info[0], Media[0]),
+    danach Breitensuche über höchstens max_depth Dict-Ebenen – flache Treffer zuerst.
+    """
+    if type(obj) is list: obj = obj[0] if obj else None
+    if type(obj) is not dict: return "", ""
+    probes = [obj]
+    for key in ("media_info", "Media"):
+        lst = obj.get(key)
+        if type(lst) is list and lst and type(lst[0]) is dict:
+            probes.append(lst[0])
+    for node in probes:
+        hit = _codec_res_at(node)
+        if hit: return hit
+
+    queue = deque([(obj, 0)])
+    while queue:
+        node, depth = queue.popleft()
+        for v in (node.values() if type(node) is dict else node):
+            t = type(v)
+            if t is dict and depth < max_depth:
+                hit = _codec_res_at(v)
+                if hit: return hit
+                queue.append((v, depth + 1))
+            elif t is list:
+                queue.append((v, depth))
     return "", ""
 
-def fetch_codec_res(rating_key: str) -> Tuple[str, str]:
-    meta = fetch_metadata(rating_key, include_children=1)
+def fetch_codec_res(rating_key: str, meta: Optional[dict] = None) -> Tuple[str, str]:
+    """meta: bereits geladene include_children-Metadaten, spart den erneuten Abruf."""
+    meta = meta or fetch_metadata(rating_key, include_children=1)
     if isinstance(meta, list): meta = meta[0]
     return find_codec_res(meta)
 
-def fetch_studio(rating_key: str) -> str:
-    meta = fetch_metadata(rating_key)
+def fetch_studio(rating_key: str, meta: Optional[dict] = None) -> str:
+    meta = meta or fetch_metadata(rating_key)
     if isinstance(meta, list): meta = meta[0]
     return meta.get("studio", "")
 
-# ---- Link-Builder (TMDB / IMDB / TVDB / Plex) ----
-def get_tmdb_link(item: dict, series_meta: dict = {}, season_meta: dict = {}) -> str:
-    guids = collect_guids(series_meta) + collect_guids(season_meta) + collect_guids(item)
-    tmdb = get_tmdb_id(item, series_meta, season_meta)
-    imdb = _extract_guid(guids, "imdb")
-    mt   = item.get("media_type", "").lower()
-
-    def tmdb_exists_link():
-        if tmdb:
-            mtype = "movie" if mt == "movie" else "tv"
-            path = "movie" if mt == "movie" else "tv"
-            if mtype == "movie":
-                return f"https://www.themoviedb.org/movie/{tmdb}?language=de-DE"
-            else:
-                return f"https://www.themoviedb.org/tv/{tmdb}?language=de-DE"
-        return None
-
-    if mt == "movie":
-        if tmdb: return tmdb_exists_link()
-        if imdb: return f"https://www.imdb.com/title/tt{imdb}"
-        return "https://www.themoviedb.org"
-    if tmdb:
-        if mt == "season":
-            s = get_season_number(item)
-            return f"https://www.themoviedb.org/tv/{tmdb}/season/{s}?language=de-DE"
-        if mt == "episode":
-            s = get_season_number(item)
-            e = int(item.get("media_index") or 0)
-            return f"https://www.themoviedb.org/tv/{tmdb}/season/{s}/episode/{e}?language=de-DE"
-        return tmdb_exists_link()
-    if imdb: return f"https://www.imdb.com/title/tt{imdb}"
-    return "https://www.themoviedb.org"
-
+# ---- Link-Builder (Plex) – TMDB-/TVDB-Links setzt build_embed zusammen ----
 def get_plex_link(item: dict) -> str:
     rk  = item["rating_key"]
     key = urllib.parse.quote(f"/library/metadata/{rk}", safe="")
     return f"{Config.PLEX_BASE_URL}/desktop/#!/server/{Config.PLEX_SERVER_ID}/details?key={key}"
 
+_TRAILER_LANG_RANK = {"de": 0, "en": 1}
+
 def get_tmdb_trailer_url(tmdb_id: str, is_movie: bool) -> Optional[str]:
     if not tmdb_id: return None
-    mtype = "movie" if is_movie else "tv"
-    data = tmdb_get(f"{mtype}/{tmdb_id}/videos")
-    vids = data.get("results", []) if data else []
-    for pref in ("de", "en", None):
-        for v in vids:
-            if v["site"].lower() == "youtube" and v["type"].lower() == "trailer":
-                if pref is None or v.get("iso_639_1", "").lower() == pref:
-                    return f"https://www.youtube.com/watch?v={v['key']}"
-    return None
+    vids = (tmdb_get_full(tmdb_id, is_movie).get("videos") or {}).get("results", [])
+    # Ein Durchlauf: Rang de=0, en=1, Rest=2 – bei Gleichstand gewinnt der erste Treffer
+    trailers = [(_TRAILER_LANG_RANK.get((v.get("iso_639_1") or "").lower(), 2), i, v["key"])
+                for i, v in enumerate(vids)
+                if (v.get("site") or "").lower() == "youtube" and (v.get("type") or "").lower() == "trailer"]
+    return f"https://www.youtube.com/watch?v={min(trailers)[2]}" if trailers else None
 
 def get_plex_trailer_url(item: dict) -> Optional[str]:
     try:
@@ -838,168 +1236,207 @@ def get_plex_trailer_url(item: dict) -> Optional[str]:
         log("warn", f"Plex-Trailer: {e}")
     return None
 
-def get_tmdb_status(item: dict, series_meta: dict = {}, season_meta: dict = {}) -> Optional[str]:
-    tmdb = get_tmdb_id(item, series_meta, season_meta)
+# Medientypen mit Serienstatus (Status-Abruf & -Anzeige)
+_SHOW_TYPES = frozenset({"season", "show", "episode"})
+
+TMDB_STATUS_MAP = {
+    "Returning Series": "Laufend",
+    "Ended":            "Beendet",
+    "Canceled":         "Abgesetzt",
+    "In Production":    "In Produktion",
+    "Planned":          "Geplant",
+    "Pilot":            "Pilotfolge",
+}
+
+def get_tmdb_status(item: dict, series_meta: Optional[dict] = None, season_meta: Optional[dict] = None, ids=None,
+                    tmdb: Optional[str] = None) -> Optional[str]:
+    tmdb = tmdb or get_tmdb_id(item, series_meta, season_meta, ids)
     if not tmdb: return None
-    data = tmdb_get(f"tv/{tmdb}", params={"language": "de-DE"})
-    if data:
-        return {
-            "Returning Series": "Laufend",
-            "Ended":            "Beendet",
-            "Canceled":         "Abgesetzt",
-            "In Production":    "In Produktion",
-            "Planned":          "Geplant",
-            "Pilot":            "Pilotfolge",
-        }.get(data.get("status"))
-    return None
+    return TMDB_STATUS_MAP.get(tmdb_get_full(tmdb, False).get("status"))
+
+def tmdb_has_season(tmdb_id: str, season_num: int, episode_num: Optional[int] = None) -> bool:
+    """Gibt es Staffel (bzw. Episode) auf TMDB? Liest die seasons-Liste des Serien-Bundles – kein eigener Request."""
+    for season in tmdb_get_full(tmdb_id, False).get("seasons") or ():
+        if season.get("season_number") == season_num:
+            return episode_num is None or 0 < episode_num <= (season.get("episode_count") or 0)
+    return False
+
+# ---- Altersfreigaben (US/Plex → FSK) ----
+RATING_MAP = {
+    "TV-Y": "FSK 0", "TV-Y7": "FSK 6", "TV-G": "FSK 0", "TV-PG": "FSK 6", "TV-14": "FSK 12", "TV-MA": "FSK 16",
+    "PG": "FSK 6", "PG-13": "FSK 12", "R": "FSK 16", "NC-17": "FSK 18", "UR": "Ungeprüft",
+    "BPjM Restricted": "FSK 18+ (indiziert)",
+    "de": "FSK 0", "de/0": "FSK 0", "de/6": "FSK 6", "de/12": "FSK 12", "de/12+": "FSK 12+",
+    "de/16": "FSK 16", "de/18": "FSK 18"
+}
 
 # ---- Embed-Generator Hauptfunktion ----
-def build_embed(item: dict, season_meta: dict = {}, series_meta: dict = {}) -> Dict:
+def build_embed(item: dict, season_meta: Optional[dict] = None, series_meta: Optional[dict] = None) -> Dict:
+    season_meta, series_meta = season_meta or {}, series_meta or {}
     style = Config.EMBED_STYLE
     mtype = detect_media_type(item)
     color = Config.COLOR_MOVIE if mtype == "movie" else Config.COLOR_SEASON if mtype == "season" else Config.COLOR_SHOW
-    embed: Dict = {"title": build_title(item, season_meta, series_meta), "color": color, "fields": []}
-
-    lib = item.get("library_name") or season_meta.get("library_name") or series_meta.get("library_name")
-    rel = (item.get("originally_available_at") or season_meta.get("originally_available_at") or series_meta.get("originally_available_at"))
-    rel_fmt = datetime.strptime(rel, "%Y-%m-%d").strftime("%d.%m.%Y") if rel else None
-
-    RATING_MAP = {
-        "TV-Y": "FSK 0", "TV-Y7": "FSK 6", "TV-G": "FSK 0", "TV-PG": "FSK 6", "TV-14": "FSK 12", "TV-MA": "FSK 16",
-        "PG": "FSK 6", "PG-13": "FSK 12", "R": "FSK 16", "NC-17": "FSK 18", "UR": "Ungeprüft",
-        "BPjM Restricted": "FSK 18+ (indiziert)",
-        "de": "FSK 0", "de/0": "FSK 0", "de/6": "FSK 6", "de/12": "FSK 12", "de/12+": "FSK 12+",
-        "de/16": "FSK 16", "de/18": "FSK 18"
-    }
-
-    cr = item.get("content_rating") or season_meta.get("content_rating") or series_meta.get("content_rating")
-    fsk = RATING_MAP.get(cr.strip(), cr.strip()) if cr else None
-    rating = (item.get("rating") or item.get("audience_rating") or item.get("user_rating") or
-              season_meta.get("rating") or season_meta.get("audience_rating") or season_meta.get("user_rating") or
-              series_meta.get("rating") or series_meta.get("audience_rating") or series_meta.get("user_rating"))
+
+    # IDs & Indizes einmalig bestimmen
+    ids = index_guids(item, season_meta, series_meta)
+    tmdb_id = get_tmdb_id(item, series_meta, season_meta, ids)
+    tvdb_series_id = get_tvdb_series_id(item, season_meta, series_meta, ids)
+    tvdb_season_id = get_tvdb_season_id(item, season_meta, series_meta, ids)
+    tvdb_ep_id     = get_tvdb_episode_id(item, season_meta, series_meta, ids)
+    s_idx = get_season_number(item)
+    e_idx = safe_int(item.get("media_index"))
+
+    # Lokale Plex-Daten – entscheiden, welche Fallbacks überhaupt nötig sind
+    metas = (item, season_meta, series_meta)
+    actors    = first("actors",    *metas) or []
+    writers   = first("writers",   *metas) or []
+    producers = first("producers", *metas) or []
+    directors = first("directors", *metas) or []
+    plot = first(("summary", "plot"), *metas)
+    edition = first(("edition_title", "edition"), item) or ""
+
+    # Plot-Fallbacklogik je nach Medientyp
+    def plot_fallback() -> Optional[str]:
+        if mtype == "episode":
+            p = None
+            # TMDB Episode
+            if tmdb_id:
+                p = tmdb_fetch_episode_plot(tmdb_id, s_idx, e_idx)
+            # TVDB Episode
+            if not p and tvdb_ep_id:
+                p = fetch_tvdb_episode_plot(tvdb_ep_id)
+            return p
+        if mtype == "season":
+            p = tmdb_fetch_overview(tmdb_id, False) if tmdb_id else None
+            return p or (fetch_tvdb_season_plot(tvdb_season_id) if tvdb_season_id else None)
+        if mtype in {"show", "series", "tvshow"}:
+            p = tmdb_fetch_overview(tmdb_id, False) if tmdb_id else None
+            return p or (fetch_tvdb_show_plot(tvdb_series_id) if tvdb_series_id else None)
+        if mtype == "movie":
+            return tmdb_fetch_overview(tmdb_id, True)
+        return None
+
+    # --- Unabhängige Tautulli/TMDB/TVDB-Abrufe parallel anstoßen ---
+    jobs, deadline = {}, time.monotonic() + Config.JOB_TIMEOUT
+    def submit(name, fn, *args):
+        jobs[name] = _POOL.submit(fn, *args)
+    def result(name, default=None):
+        if name not in jobs: return default
+        try:
+            return jobs[name].result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            jobs[name].cancel()             # noch nicht gestartete Jobs gar nicht erst ausführen
+            log("warn", f"{name}: keine Antwort innerhalb von {Config.JOB_TIMEOUT}s – übersprungen")
+            return default
+
+    submit("title", build_title, item, season_meta, series_meta)
+    submit("image", choose_image, tmdb_id, tvdb_series_id, mtype == "movie", style)
+    # include_children-Metadaten: Staffel-Laufzeit bzw. Footer (Codec/Studio fehlen lokal)
+    codec, res = find_codec_res(item)
+    studio = first("studio", *metas)
+    if mtype == "season" or not codec or not res or not studio:
+        submit("full_meta", fetch_metadata, item["rating_key"], 1)
+    if tmdb_id and (not actors or not writers or not producers or not directors):
+        submit("credits", tmdb_fetch_credits, tmdb_id, mtype == "movie")
+    if tmdb_id and mtype in _SHOW_TYPES:
+        submit("status", get_tmdb_status, item, series_meta, season_meta, ids, tmdb_id)
+    if not plot:
+        submit("plot", plot_fallback)
+    if not edition and mtype == "movie" and tmdb_id:
+        submit("edition", tmdb_fetch_edition, tmdb_id)
+    if tmdb_id:
+        submit("trailer", get_tmdb_trailer_url, tmdb_id, mtype == "movie")
+    # Existenz-Check für den TMDB-Link (aus dem Serien-Bundle, das der Status-Job ohnehin lädt)
+    if tmdb_id and mtype == "season":
+        submit("tmdb_page", tmdb_has_season, tmdb_id, s_idx)
+    elif tmdb_id and mtype == "episode":
+        submit("tmdb_page", tmdb_has_season, tmdb_id, s_idx, e_idx)
+
+    embed: Dict = {"title": result("title", item.get("title") or ""), "color": color, "fields": []}
+
+    lib = first("library_name", *metas)
+    rel = first("originally_available_at", *metas)
+    rel_fmt = format_date(rel) if rel else None
+
+    cr = first("content_rating", *metas)
+    if cr: cr = cr.strip()
+    fsk = RATING_MAP.get(cr, cr) if cr else None
+    rating = first(("rating", "audience_rating", "user_rating"), *metas)
     rating_str = f"{float(rating):.1f}/10" if str(rating).replace(".", "", 1).isdigit() else rating
 
     # Laufzeit
+    full_meta = result("full_meta", {})              # include_children-Abruf, wird ggf. wiederverwendet
     if mtype == "season":
-        children = fetch_metadata(item["rating_key"], include_children=1).get("children", [])
-        mins = sum(int(ep.get("duration", 0)) for ep in children) // 60000
+        children = full_meta.get("children", [])
+        # fehlende Dauern überspringen, int() läuft per map() in C
+        mins = sum(map(int, filter(None, (ep.get("duration") for ep in children)))) // 60000
     else:
-        dur = item.get("duration") or season_meta.get("duration") or series_meta.get("duration")
+        dur = first("duration", *metas)
         mins = int(dur) // 60000 if dur else None
     dauer_str = f"{mins // 60} Std. {mins % 60} Min" if mins and mins >= 60 else (f"{mins} Min" if mins else None)
 
-    genres = item.get("genres") or season_meta.get("genres") or series_meta.get("genres") or []
+    genres = first("genres", *metas) or []
     genre = ", ".join(genres[:2]) if genres else None
-    tmdb_status = get_tmdb_status(item, series_meta, season_meta)
-    tmdb_id = get_tmdb_id(item, series_meta, season_meta)
-    tvdb_series_id = get_tvdb_series_id(item, season_meta, series_meta)
-    tvdb_season_id = get_tvdb_season_id(item, season_meta, series_meta)
-    tvdb_ep_id     = get_tvdb_episode_id(item, season_meta, series_meta)
+    tmdb_status = result("status")
 
     # --- Cast & Crew ---
-    actors    = item.get("actors")    or season_meta.get("actors")    or series_meta.get("actors")    or []
-    writers   = item.get("writers")   or season_meta.get("writers")   or series_meta.get("writers")   or []
-    producers = item.get("producers") or season_meta.get("producers") or series_meta.get("producers") or []
-    directors = item.get("directors") or season_meta.get("directors") or series_meta.get("directors") or []
-
-    tmdb_credits = {}
-    if tmdb_id and (not actors or not writers or not producers or not directors):
-        tmdb_credits = tmdb_fetch_credits(tmdb_id, mtype == "movie") or {}
+    tmdb_credits = result("credits") or {}
 
     actor = actors[0] if mtype in {"movie", "episode"} and actors else None
     if not actor and tmdb_credits.get("cast"):
         actor = tmdb_credits["cast"][0]["name"]
 
-    def tmdb_get_crew(job: str) -> Optional[str]:
-        if tmdb_credits.get("crew"):
-            for p in tmdb_credits["crew"]:
-                if p.get("job", "").lower() == job.lower():
-                    return p.get("name")
-        return None
+    # Crew einmal nach Job indizieren (erster Eintrag je Job gewinnt) statt je Rolle neu zu suchen
+    crew: Dict[str, str] = {}
+    for p in tmdb_credits.get("crew") or ():
+        crew.setdefault(p.get("job", "").lower(), p.get("name"))
 
-    writer   = writers[0]   if writers   else tmdb_get_crew("Writer")
-    producer = producers[0] if producers else tmdb_get_crew("Producer")
-    director = directors[0] if directors else tmdb_get_crew("Director")
+    writer   = writers[0]   if writers   else crew.get("writer")
+    producer = producers[0] if producers else crew.get("producer")
+    director = directors[0] if directors else crew.get("director")
     main_info = ("Autor: "     + writer)   if writer   else \
                 ("Produzent: " + producer) if producer else \
                 ("Regie: "     + director) if director else ""
 
-    # --- Media-Info-Block ---
+    # --- Media-Info-Block: eine Tabelle, drei Darstellungen ---
+    status   = tmdb_status if mtype in _SHOW_TYPES else None
+    starring = actor if mtype == "movie" else None
     if style == "boxed":
-        mi = []
-        if genre:     mi.append(f"[**Genre**]  {genre}")
-        if rel_fmt:   mi.append(f"[**Jahr**]  {rel_fmt}")
-        if mtype in {"season", "show", "episode"} and tmdb_status:
-            mi.append(f"[**Status**]  {tmdb_status}")
-        if fsk or rating_str:
-            b = rating_str or ""
-            if fsk: b += f" ({fsk})" if rating_str else fsk
-            mi.append(f"[**Bewertung**]  {b}")
-        if dauer_str: mi.append(f"[**Dauer**]  {dauer_str}")
+        bewertung = f"{rating_str} ({fsk})" if rating_str and fsk else rating_str or fsk
+        spec = [("Genre", genre), ("Jahr", rel_fmt), ("Status", status), ("Bewertung", bewertung), ("Dauer", dauer_str)]
         embed["fields"].append({
             "name": f"📌 **Media-Info:** {lib}" if lib else "📌 **Media-Info:**",
-            "value": indent_block("\n".join(mi)),
+            "value": indent_block("\n".join(f"[**{n}**]  {v}" for n, v in spec if v)),
             "inline": False
         })
-    elif style == "telegram":
-        bold = lambda t: f"**{t}**" if t else ""
-        info = [
-            f"Bereich → {bold(lib)}" if lib else "",
-            f"Release → {bold(rel_fmt)}" if rel_fmt else "",
-            f"Bewertung → {bold(', '.join(filter(None, [fsk, rating_str])))}" if fsk or rating_str else "",
-            f"Dauer → {bold(dauer_str)}" if dauer_str else "",
-            f"Genre → {bold(genre)}" if genre else "",
-            f"Status → {bold(tmdb_status)}" if mtype in {"season", "show", "episode"} and tmdb_status else "",
-            f"Starring → {bold(actor)}" if mtype == "movie" and actor else ""
+    else:
+        bewertung = ", ".join(filter(None, [fsk, rating_str]))
+        spec = [  # (telegram, klassisch, Wert)
+            ("Bereich",   "Library",        lib),
+            ("Release",   "Veröffentlicht", rel_fmt),
+            ("Bewertung", "Bewertung",      bewertung),
+            ("Dauer",     "Dauer",          dauer_str),
+            ("Genre",     "Genre",          genre),
+            ("Status",    "Status",         status),
+            ("Starring",  "Starring",       starring),
         ]
-        info = [x for x in info if x]
-        if info:
-            embed["description"] = indent_block("\n".join(info))
-    else:  # klassisch
-        if lib:        embed["fields"].append({"name": "Library", "value": lib, "inline": True})
-        if rel_fmt:    embed["fields"].append({"name": "Veröffentlicht", "value": rel_fmt, "inline": True})
-        if fsk or rating_str:
-            embed["fields"].append({"name": "Bewertung", "value": ", ".join(filter(None, [fsk, rating_str])), "inline": True})
-        if dauer_str:  embed["fields"].append({"name": "Dauer", "value": dauer_str, "inline": True})
-        if genre:      embed["fields"].append({"name": "Genre", "value": genre, "inline": True})
-        if mtype in {"season", "show", "episode"} and tmdb_status:
-            embed["fields"].append({"name": "Status", "value": tmdb_status, "inline": True})
-        if mtype == "movie" and actor:
-            embed["fields"].append({"name": "Starring", "value": actor, "inline": True})
+        if style == "telegram":
+            info = [f"{n} → **{v}**" for n, _, v in spec if v]
+            if info:
+                embed["description"] = indent_block("\n".join(info))
+        else:  # klassisch
+            embed["fields"].extend({"name": n, "value": v, "inline": True} for _, n, v in spec if v)
 
     # --- Handlung / Plot ---
-    plot = (item.get("summary") or item.get("plot") or season_meta.get("summary") or
-            season_meta.get("plot") or series_meta.get("summary") or series_meta.get("plot"))
-
-    # Plot-Fallbacklogik je nach Medientyp
-    if mtype == "episode" and not plot:
-        s_idx = get_season_number(item); e_idx = safe_int(item.get("media_index"))
-        plot = None
-        # TMDB Episode
-        if tmdb_id:
-            plot = tmdb_fetch_episode_plot(tmdb_id, s_idx, e_idx, lang="de-DE") or \
-                   tmdb_fetch_episode_plot(tmdb_id, s_idx, e_idx, lang="en-US")
-        # TVDB Episode
-        if not plot and tvdb_ep_id:
-            plot = fetch_tvdb_episode_plot(tvdb_ep_id)
-    elif mtype == "season" and not plot:
-        if tmdb_id: plot = tmdb_fetch_overview(tmdb_id, False)
-        if not plot and tvdb_season_id:
-            plot = fetch_tvdb_season_plot(tvdb_season_id)
-    elif mtype in {"show", "series", "tvshow"} and not plot:
-        if tmdb_id: plot = tmdb_fetch_overview(tmdb_id, False)
-        if not plot and tvdb_series_id:
-            plot = fetch_tvdb_show_plot(tvdb_series_id)
-    elif mtype == "movie" and not plot:
-        plot = tmdb_fetch_overview(tmdb_id, True)
-
+    plot = plot or result("plot")
     if plot:
         norm = normalize_plot_text(plot)
         too_long = len(norm) > Config.PLOT_LIMIT
         if too_long: norm = norm[:Config.PLOT_LIMIT].rstrip()
         norm_wrapped = insert_line_breaks(norm)
         lines = norm_wrapped.splitlines()
-        abgeschnitten = (too_long or len(" ".join(lines)) < len(norm))
+        # Zeilen sind mit "\n" statt " " verbunden – gleiche Länge, kein zusammengesetzter String nötig
+        abgeschnitten = too_long or len(norm_wrapped) < len(norm)
         if abgeschnitten and lines and not lines[-1].endswith(("…", "...")):
             lines[-1] = lines[-1].rstrip(" .") + " …"
         plot_txt = indent_block("\n".join(lines))
@@ -1011,8 +1448,6 @@ def build_embed(item: dict, season_meta: dict = {}, series_meta: dict = {}) -> D
 
     # --- Details-Block ---
     season_total = safe_int(series_meta.get("childCount"))
-    s_idx = get_season_number(item)
-    e_idx = safe_int(item.get("media_index"))
 
     if   mtype == "movie":   details_label = f"🎞️ Details – Film → {item.get('year', '')}"
     elif mtype == "season":  details_label = f"🎞️ Details – Staffel → {s_idx}" + (f" von {season_total}" if season_total else "")
@@ -1024,12 +1459,10 @@ def build_embed(item: dict, season_meta: dict = {}, series_meta: dict = {}) -> D
     if audio_langs:
         details_label += f" ← {', '.join(audio_langs)}"
 
-    edition = item.get("edition_title") or item.get("edition") or ""
-    if not edition and mtype == "movie" and tmdb_id:
-        edition = tmdb_fetch_edition(tmdb_id)
+    edition = edition or result("edition")
     edition_line = f"Edition: {edition}" if edition else ""
 
-    trailer      = get_tmdb_trailer_url(tmdb_id, mtype == "movie")
+    trailer      = result("trailer")
     plex_trailer = get_plex_trailer_url(item)
 
     # --- Link-Logik ---
@@ -1040,15 +1473,12 @@ def build_embed(item: dict, season_meta: dict = {}, series_meta: dict = {}) -> D
         if mtype == "movie":
             tmdb_link = f"https://www.themoviedb.org/movie/{tmdb_id}?language=de-DE"
         elif mtype == "season":
-            s = get_season_number(item)
             # Prüfe, ob Staffel auf TMDB existiert
-            if tmdb_get(f"tv/{tmdb_id}/season/{s}", params={"language": "de-DE"}).get("id"):
-                tmdb_link = f"https://www.themoviedb.org/tv/{tmdb_id}/season/{s}?language=de-DE"
+            if result("tmdb_page", False):
+                tmdb_link = f"https://www.themoviedb.org/tv/{tmdb_id}/season/{s_idx}?language=de-DE"
         elif mtype == "episode":
-            s = get_season_number(item)
-            e = safe_int(item.get("media_index"))
-            if tmdb_get(f"tv/{tmdb_id}/season/{s}/episode/{e}", params={"language": "de-DE"}).get("id"):
-                tmdb_link = f"https://www.themoviedb.org/tv/{tmdb_id}/season/{s}/episode/{e}?language=de-DE"
+            if result("tmdb_page", False):
+                tmdb_link = f"https://www.themoviedb.org/tv/{tmdb_id}/season/{s_idx}/episode/{e_idx}?language=de-DE"
         else:
             # Serie
             tmdb_link = f"https://www.themoviedb.org/tv/{tmdb_id}?language=de-DE"
@@ -1056,7 +1486,7 @@ def build_embed(item: dict, season_meta: dict = {}, series_meta: dict = {}) -> D
     if tmdb_link:
         links.append(f"[TMDB]({tmdb_link})")
     elif mtype in {"episode", "season", "show", "series"}:
-        tvdb_link = build_tvdb_link(item, season_meta, series_meta)
+        tvdb_link = build_tvdb_link(item, season_meta, series_meta, ids)
         if tvdb_link:
             links.append(f"[TVDB]({tvdb_link})")
 
@@ -1082,22 +1512,14 @@ def build_embed(item: dict, season_meta: dict = {}, series_meta: dict = {}) -> D
     embed["fields"].append({"name": details_label, "value": details_val, "inline": False})
 
     # --- Bildwahl ---
-    img_url = choose_image(
-        tmdb_id          = tmdb_id,
-        tvdb_series_id   = tvdb_series_id,
-        is_movie         = (mtype == "movie"),
-        style            = style
-    )
-    embed["image"] = {"url": img_url}
+    embed["image"] = {"url": result("image", Config.PLACEHOLDER_IMG)}
 
     # --- Footer: Studio • Codec • Auflösung • Datum ---
-    codec, res = find_codec_res(item)
     if not codec or not res:
-        codec, res = fetch_codec_res(item["rating_key"])
-    studio = (item.get("studio") or season_meta.get("studio") or
-              series_meta.get("studio") or fetch_studio(item["rating_key"]))
+        codec, res = fetch_codec_res(item["rating_key"], full_meta)
+    studio = studio or fetch_studio(item["rating_key"], full_meta)
     footer = " • ".join(p for p in (
-        studio, codec, res, datetime.now().strftime("%d.%m.%Y, %H:%M")) if p)
+        studio, codec, res, footer_stamp(int(time.time() // 60))) if p)
     embed["footer"] = {"text": footer}
 
     return embed
@@ -1119,11 +1541,11 @@ def get_rating_key():
             return rk
     if not sys.stdin.isatty():
         try:
-            raw = sys.stdin.read()
-            if raw.strip():
-                if raw.strip().isdigit():
-                    return raw.strip()
-                data = json.loads(raw)
+            raw = sys.stdin.read().strip()
+            if raw:
+                if raw.isdigit():
+                    return raw
+                data = json_loads(raw)
                 for name in env_names:
                     if name in data:
                         return data[name]
@@ -1131,65 +1553,157 @@ def get_rating_key():
             pass
     return None
 
+# ---- Discord-Versand: Warteschlange + Sammel-POST ----
+def queue_embed(record: dict, embed: dict):
+    with FileLock(Config.DISCORD_QUEUE_FILE) as f:
+        f.seek(0, os.SEEK_END)
+        f.write(json_line({"record": record, "embed": embed}))
+
+def take_queued_embeds() -> List[dict]:
+    """Leert die Warteschlange unter Lock – wer zuerst kommt, versendet alles."""
+    with FileLock(Config.DISCORD_QUEUE_FILE) as f:
+        raw = f.read()
+        f.seek(0)
+        f.truncate()
+    queued = []
+    for line in raw.splitlines():
+        try:
+            queued.append(json_loads(line))
+        except ValueError:
+            continue
+    return queued
+
+def embed_chars(embed: dict) -> int:
+    n = len(embed.get("title", "")) + len(embed.get("description", ""))
+    n += len(embed.get("footer", {}).get("text", ""))
+    return n + sum(len(f.get("name", "")) + len(f.get("value", "")) for f in embed.get("fields", []))
+
+def batch_embeds(queued: List[dict]) -> List[List[dict]]:
+    """Max. DISCORD_MAX_EMBEDS Embeds bzw. DISCORD_MAX_CHARS Zeichen pro Nachricht."""
+    batches, cur, cur_chars = [], [], 0
+    for q in queued:
+        n = embed_chars(q["embed"])
+        if cur and (len(cur) >= Config.DISCORD_MAX_EMBEDS or cur_chars + n > Config.DISCORD_MAX_CHARS):
+            batches.append(cur); cur, cur_chars = [], 0
+        cur.append(q); cur_chars += n
+    if cur: batches.append(cur)
+    return batches
+
+def discord_retry_after(resp) -> float:
+    """Wartezeit nach 429: Retry-After / X-RateLimit-Reset-After (Sekunden, auch gebrochen) oder JSON retry_after."""
+    for h in ("Retry-After", "X-RateLimit-Reset-After"):
+        with contextlib.suppress(TypeError, ValueError):
+            return float(resp.headers.get(h))
+    with contextlib.suppress(ValueError, KeyError, TypeError):
+        return float(resp_json(resp)["retry_after"])
+    return 5.0
+
+def post_to_discord(embeds: List[dict]) -> str:
+    """POST; 5xx/Timeouts wiederholt der Adapter, 429 hier per Retry-After; danach Webhook-Bucket (X-RateLimit-*)."""
+    body = json_dumps({"embeds": embeds})
+    for attempt in range(1, Config.RETRY_TOTAL + 1):
+        try:
+            resp = tpost(Config.WEBHOOK_URL, data=body,
+                         headers={"Content-Type": "application/json"}, timeout=Config.DISCORD_TIMEOUT)
+        except requests.exceptions.Timeout:
+            log("warn", f"Timeout ({Config.DISCORD_TIMEOUT}s) nach {Config.RETRY_TOTAL} Versuchen")
+            return "fail"
+        except Exception as e:
+            log("warn", f"Discord-POST Fehler: {e}")
+            return "fail"
+        if resp.status_code == 429 and attempt < Config.RETRY_TOTAL:
+            wait = discord_retry_after(resp)
+            log("warn", f"Rate-Limit – warte {wait}s")
+            time.sleep(wait); continue
+        if not resp.ok:
+            log("warn", f"Discord-Fehler {resp.status_code}: {resp.text[:200]}")
+            return "fail"
+        log("info", f"{len(embeds)} Embed(s) an Discord gesendet.")
+        if resp.headers.get("X-RateLimit-Remaining") == "0":
+            time.sleep(float(resp.headers.get("X-RateLimit-Reset-After", 1)))
+        return "sent"
+    return "fail"
+
+def finish_batch(store: PostedKeyStore, batch: List[dict]):
+    status = post_to_discord([q["embed"] for q in batch])
+    if status != "sent":
+        log("error", "Discord-POST dauerhaft fehlgeschlagen")
+    for q in batch:
+        try:
+            store.append(dict(q["record"], status=status))
+        except OSError as e:
+            log("error", f"FileLock/Journal: {e}")
+
+def flush_embed_queue(store: PostedKeyStore):
+    try:
+        queued = take_queued_embeds()
+    except OSError as e:
+        log("error", f"Warteschlange: {e}"); return
+    if not queued:
+        log("info", "Warteschlange bereits von paralleler Instanz versendet.")
+    for batch in batch_embeds(queued):
+        finish_batch(store, batch)
+
 def main() -> None:
     rk = get_rating_key() or guess_latest_rating_key()
     if not rk:
         log("error", "rating_key fehlt – Abbruch.")
         sys.exit(1)
 
+    # ---- Schneller Duplikat-Check nur über den rating_key (spart den Tautulli-Abruf)
+    store = PostedKeyStore(Config.POSTED_KEYS_FILE, Config.POSTED_KEYS_MAX, Config.POSTED_KEYS_LEGACY)
+    try:
+        if store.load().is_posted(rk):
+            log("info", "Bereits gepostet – abgebrochen."); return
+    except OSError as e:
+        log("error", f"FileLock/Journal: {e}")
+
     item = fetch_metadata(rk)
     if not item:
         log("error", "Metadaten nicht gefunden"); sys.exit(1)
 
-    # ---- Duplikat-Check + pending-Eintrag --------------------
-    with locked_posted_keys() as posted:
-        sig = build_dupe_signature(item)
-        if any(d.get("rating_key") == str(rk) or d.get("signature") == sig for d in posted):
+    # ---- Duplikat-Check (Signatur) + pending-Eintrag ---------
+    record = {"rating_key": str(rk), "signature": build_dupe_signature(item),
+              "ts": int(time.time()), "status": "pending"}
+    try:
+        if not store.claim(record):
             log("info", "Bereits gepostet – abgebrochen."); return
-        posted.append({"rating_key": str(rk), "signature": sig,
-                       "ts": int(time.time()), "status": "pending"})
+    except OSError as e:
+        log("error", f"FileLock/Journal: {e}")
 
     # ---- Saison- / Serien-Metadaten laden --------------------
-    season_meta, series_meta = {}, {}
+    season_rk = series_rk = None
     if item.get("media_type") == "episode":
-        if item.get("parent_rating_key"):
-            season_meta = fetch_metadata(item["parent_rating_key"])
-        if item.get("grandparent_rating_key"):
-            series_meta = fetch_metadata(item["grandparent_rating_key"])
-    elif item.get("media_type") == "season" and item.get("parent_rating_key"):
-        series_meta = fetch_metadata(item["parent_rating_key"])
+        season_rk, series_rk = item.get("parent_rating_key"), item.get("grandparent_rating_key")
+    elif item.get("media_type") == "season":
+        series_rk = item.get("parent_rating_key")
+    season_job = _POOL.submit(fetch_metadata, season_rk) if season_rk else None
+    series_job = _POOL.submit(fetch_metadata, series_rk) if series_rk else None
+    season_meta = season_job.result() if season_job else {}
+    series_meta = series_job.result() if series_job else {}
 
     embed = build_embed(item, season_meta, series_meta)
 
-    # ---- Discord POST mit Retry ------------------------------
-    status = "fail"
-    for attempt in range(1, Config.RETRY_TOTAL + 1):
-        try:
-            resp = requests.post(Config.WEBHOOK_URL, json={"embeds": [embed]}, timeout=Config.DISCORD_TIMEOUT)
-            if resp.ok:
-                log("info", "Embed an Discord gesendet.")
-                status = "sent"
-                break
-            if resp.status_code == 429:
-                wait = int(resp.headers.get("Retry-After", 5))
-                log("warn", f"Rate-Limit – warte {wait}s")
-                time.sleep(wait); continue
-            log("warn", f"Discord-Fehler {resp.status_code}: {resp.text[:200]}")
-        except requests.exceptions.Timeout:
-            log("warn", f"Timeout ({Config.DISCORD_TIMEOUT}s) – Versuch {attempt}")
-        except Exception as e:
-            log("warn", f"Discord-POST Fehler: {e}")
-        if attempt < Config.RETRY_TOTAL:
-            time.sleep(attempt * 2)
-
-    # ---- Status aktualisieren -------------------------------
-    with locked_posted_keys() as posted:
-        for d in posted:
-            if d.get("rating_key") == str(rk) or d.get("signature") == sig:
-                d["status"] = status; break
-
-    if status != "sent":
-        log("error", "Discord-POST dauerhaft fehlgeschlagen")
+    # ---- In Warteschlange, kurz sammeln, dann gebündelt senden
+    try:
+        queue_embed(record, embed)
+    except OSError as e:
+        log("error", f"Warteschlange: {e} – sende direkt")
+        finish_batch(store, [{"record": record, "embed": embed}])
+        return
+    if Config.DISCORD_BATCH_WINDOW > 0:
+        time.sleep(Config.DISCORD_BATCH_WINDOW)
+    flush_embed_queue(store)
+
+def shutdown_pool():
+    """Wartende Jobs verwerfen (cancel_futures ab Python 3.9); laufende Requests enden mit ihrem HTTP-Timeout."""
+    try:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+    except TypeError:
+        _POOL.shutdown(wait=False)
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        shutdown_pool()